@@ -1,22 +1,34 @@
 import os
 import subprocess
-from typing import List
+from typing import List, Optional
 import numpy as np
 import librosa
 from VideoEditorAI.core.config import settings
+from VideoEditorAI.analysis.pcm import open_pcm
 
 class AudioProcessor:
     def __init__(self):
         self.sample_rate = 22050
+        # librosa.feature.rms defaults
+        self.frame_length = 2048
+        self.hop_length = 512
+        # (cache key, (rms, sr, duration)) for the last analysed file
+        self._rms_cache = None
 
-    def extract_audio(self, video_path: str) -> str:
-        """Extracts audio from video functionality using ffmpeg."""
+    def extract_audio(self, video_path: str, output_dir: Optional[str] = None) -> str:
+        """
+        Extracts audio from video functionality using ffmpeg.
+        Pass a job workspace as output_dir so concurrent jobs never share a file.
+        """
         if not os.path.exists(video_path):
             raise FileNotFoundError(f"Video file not found: {video_path}")
 
-        base_name = os.path.basename(video_path)
-        audio_filename = f"{os.path.splitext(base_name)[0]}.wav"
-        output_path = os.path.join(settings.TEMP_DIR, audio_filename)
+        if output_dir is not None:
+            output_path = os.path.join(output_dir, "audio.wav")
+        else:
+            base_name = os.path.basename(video_path)
+            audio_filename = f"{os.path.splitext(base_name)[0]}.wav"
+            output_path = os.path.join(settings.TEMP_DIR, audio_filename)
         
         # Overwrite if exists
         if os.path.exists(output_path):
@@ -28,7 +40,7 @@ class AudioProcessor:
             "ffmpeg", "-i", video_path,
             "-vn", # No video
             "-acodec", "pcm_s16le", # WAV codec
-            "-ar", "22050", # Sample rate
+            "-ar", str(self.sample_rate), # Sample rate
             "-ac", "1", # Mono for analysis is usually fine
             "-y", # Overwrite
             "-loglevel", "error",
@@ -39,16 +51,43 @@ class AudioProcessor:
         subprocess.run(command, check=True)
         return output_path
 
+    def estimate_wav_size(self, duration: float) -> int:
+        """Bytes extract_audio will write for `duration` seconds (mono 16-bit + header)."""
+        return int(duration * self.sample_rate * 2) + 4096
+
+    def _frame_rms(self, audio_path: str):
+        """
+        Returns (rms, sample_rate, duration) for the file.
+        Our own extracted WAVs are read through a memory map without decoding or
+        resampling; anything else falls back to librosa.load.
+        """
+        stat = os.stat(audio_path)
+        key = (audio_path, stat.st_size, stat.st_mtime_ns)
+        cached = self._rms_cache
+        if cached is not None and cached[0] == key:
+            return cached[1]
+
+        reader = open_pcm(audio_path, sample_rate=self.sample_rate)
+        if reader is not None:
+            with reader:
+                rms = reader.frame_rms(frame_length=self.frame_length, hop_length=self.hop_length)
+                sr, duration = reader.sample_rate, reader.duration
+        else:
+            y, sr = librosa.load(audio_path, sr=self.sample_rate)
+            rms = librosa.feature.rms(y=y, frame_length=self.frame_length, hop_length=self.hop_length)[0]
+            duration = librosa.get_duration(y=y, sr=sr)
+
+        self._rms_cache = (key, (rms, sr, duration))
+        return rms, sr, duration
+
     def detect_silence(self, audio_path: str):
         """
         Detects silent segments in the audio file.
         Returns a list of (start_time, end_time) tuples.
         """
         print(f"[DEBUG] Loading audio for silence detection from: {audio_path}")
-        y, sr = librosa.load(audio_path, sr=self.sample_rate)
-        
         # Compute RMS energy
-        rms = librosa.feature.rms(y=y)[0]
+        rms, sr, _ = self._frame_rms(audio_path)
         
         # Convert dB threshold to linear amplitude
         # db = 20 * log10(amp) -> amp = 10^(db/20)
@@ -63,7 +102,7 @@ class AudioProcessor:
         silent_intervals = []
         current_start = None
         
-        frames_to_time = librosa.frames_to_time(np.arange(len(db)), sr=sr)
+        frames_to_time = librosa.frames_to_time(np.arange(len(db)), sr=sr, hop_length=self.hop_length)
         
         for i, silent in enumerate(is_silent):
             t = frames_to_time[i]
@@ -90,9 +129,8 @@ class AudioProcessor:
         Identify top N high-energy segments (approx 5s long).
         Returns list of (start, end) tuples.
         """
-        y, sr = librosa.load(audio_path, sr=self.sample_rate)
-        rms = librosa.feature.rms(y=y)[0]
-        frames_to_time = librosa.frames_to_time(np.arange(len(rms)), sr=sr)
+        rms, sr, duration = self._frame_rms(audio_path)
+        frames_to_time = librosa.frames_to_time(np.arange(len(rms)), sr=sr, hop_length=self.hop_length)
         
         # Smooth the signal to find sustained peaks, not just transient clicks
         # Simple moving average
@@ -104,10 +142,7 @@ class AudioProcessor:
         
         peaks = []
         rms_cp = rms.copy()
-        duration = librosa.get_duration(y=y, sr=sr)
-        
-        # hop_length is 512 by default in librosa.feature.rms
-        hop_length = 512
+        hop_length = self.hop_length
         
         for _ in range(top_n):
             max_idx = np.argmax(rms_cp)
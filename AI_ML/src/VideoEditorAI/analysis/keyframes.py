@@ -0,0 +1,199 @@
+import bisect
+import os
+import subprocess
+from typing import List, Optional, Sequence
+import numpy as np
+from VideoEditorAI.core.config import settings
+from VideoEditorAI.core.models import EditingSuggestion, SegmentType
+from VideoEditorAI.analysis.pcm import PCMReader
+
+KEYFRAMES_FILE = "keyframes.npz"
+
+class KeyframeIndex:
+    """
+    Packet and keyframe times of a video's first stream, from a single ffprobe pass
+    over packet headers (nothing is decoded). Cached as an .npz file so later
+    renders and exports of the same analysis never probe again.
+
+    Lookups bisect a sorted list of floats, so each one takes microseconds.
+    """
+
+    def __init__(self, packet_times: Sequence[float], keyframe_mask: Optional[Sequence[bool]] = None):
+        self.packet_times = np.asarray(packet_times, dtype=np.float64)
+        if keyframe_mask is None:
+            keyframe_mask = np.ones(len(self.packet_times), dtype=bool)
+        self.keyframe_mask = np.asarray(keyframe_mask, dtype=bool)
+        # Packets are in decode order; presentation order is sorted by pts
+        order = np.argsort(self.packet_times, kind="stable")
+        self.packet_times = self.packet_times[order]
+        self.keyframe_mask = self.keyframe_mask[order]
+        # Plain lists: bisect on them is much faster than on numpy scalars
+        self.keyframes: List[float] = self.packet_times[self.keyframe_mask].tolist()
+        self._frames: List[float] = self.packet_times.tolist()
+
+    @classmethod
+    def from_times(cls, keyframes: Sequence[float]) -> "KeyframeIndex":
+        """An index that only knows keyframe times (e.g. passed in by a caller)."""
+        return cls(keyframes)
+
+    @classmethod
+    def build(cls, video_path: str) -> "KeyframeIndex":
+        command = [
+            "ffprobe",
+            "-v", "error",
+            "-select_streams", "v:0",
+            "-show_entries", "packet=pts_time,flags",
+            "-of", "csv=p=0",
+            video_path
+        ]
+        result = subprocess.run(command, capture_output=True, text=True, check=True)
+        times, mask = [], []
+        for line in result.stdout.splitlines():
+            pts, _, flags = line.partition(",")
+            if pts in ("", "N/A"):
+                continue
+            times.append(float(pts))
+            mask.append("K" in flags)
+        print(f"INFO:ai.keyframes:Indexed {len(times)} packets, {sum(mask)} keyframes.")
+        return cls(times, mask)
+
+    @classmethod
+    def load_or_build(cls, video_path: str, cache_path: str) -> "KeyframeIndex":
+        """Loads the cached index if it was built from this exact file, else probes and caches it."""
+        stat = os.stat(video_path)
+        source = np.array([stat.st_size, stat.st_mtime_ns], dtype=np.int64)
+        if os.path.exists(cache_path):
+            try:
+                with np.load(cache_path) as cached:
+                    if np.array_equal(cached["source"], source):
+                        return cls(cached["packet_times"], cached["keyframe_mask"])
+            except (OSError, KeyError, ValueError):
+                pass
+
+        index = cls.build(video_path)
+        tmp_path = cache_path + ".tmp.npz"
+        np.savez(tmp_path, packet_times=index.packet_times, keyframe_mask=index.keyframe_mask, source=source)
+        os.replace(tmp_path, cache_path)
+        return index
+
+    def __len__(self) -> int:
+        return len(self.keyframes)
+
+    def previous(self, t: float) -> Optional[float]:
+        """Last keyframe at or before t."""
+        i = bisect.bisect_right(self.keyframes, t + 1e-6)
+        return self.keyframes[i - 1] if i else None
+
+    def next(self, t: float) -> Optional[float]:
+        """First keyframe at or after t."""
+        i = bisect.bisect_left(self.keyframes, t - 1e-6)
+        return self.keyframes[i] if i < len(self.keyframes) else None
+
+    def nearest(self, t: float, tolerance: float = float("inf")) -> Optional[float]:
+        """Closest keyframe to t, if within tolerance."""
+        return _nearest(self.keyframes, t, tolerance)
+
+    def nearest_frame(self, t: float) -> Optional[float]:
+        """Presentation time of the frame closest to t."""
+        return _nearest(self._frames, t, float("inf"))
+
+    def next_frame(self, t: float) -> Optional[float]:
+        """Presentation time of the first frame at or after t."""
+        i = bisect.bisect_left(self._frames, t - 1e-6)
+        return self._frames[i] if i < len(self._frames) else None
+
+    def previous_frame(self, t: float) -> Optional[float]:
+        """Presentation time of the last frame at or before t."""
+        i = bisect.bisect_right(self._frames, t + 1e-6)
+        return self._frames[i - 1] if i else None
+
+def _nearest(sorted_times: List[float], t: float, tolerance: float) -> Optional[float]:
+    i = bisect.bisect_left(sorted_times, t)
+    best = None
+    for j in (i - 1, i):
+        if 0 <= j < len(sorted_times) and abs(sorted_times[j] - t) <= tolerance:
+            if best is None or abs(sorted_times[j] - t) < abs(best - t):
+                best = sorted_times[j]
+    return best
+
+def nearest_zero_crossing(reader: PCMReader, t: float, window: float, direction: int = 0) -> Optional[float]:
+    """
+    Time of the audio zero crossing closest to t within window seconds: on either
+    side (direction 0), at or after t (direction > 0) or at or before t (direction < 0).
+    """
+    sr = reader.sample_rate
+    center = int(round(t * sr))
+    lo = max(0, center - int(window * sr)) if direction <= 0 else center
+    hi = min(len(reader.samples), center + int(window * sr) + 1) if direction >= 0 else center + 1
+    if hi - lo < 2:
+        return None
+    block = reader.samples[lo:hi]
+    # A crossing sits between i-1 and i when the sign flips (or at an exact zero)
+    crossings = np.flatnonzero(np.signbit(block[1:]) != np.signbit(block[:-1])) + 1
+    if not len(crossings):
+        return None
+    best = crossings[np.argmin(np.abs(crossings + lo - center))]
+    return (best + lo) / float(sr)
+
+class BoundarySnapper:
+    """
+    Moves CUT boundaries onto positions where an edit is clean:
+    "keyframe" - a keyframe within CUT_SNAP_TOLERANCE (stream-copy renders need no re-encode),
+    "frame" - a frame boundary,
+    "zero_crossing" - an audio zero crossing within CUT_SNAP_WINDOW (no click at the cut).
+
+    Cut edges only move inward (start later, end earlier), like scene snapping, so
+    a cut never grows into the speech around the silence or segment it came from.
+    """
+
+    MODES = ("keyframe", "frame", "zero_crossing")
+
+    def __init__(self, mode: str, keyframes: Optional[KeyframeIndex] = None, audio: Optional[PCMReader] = None):
+        if mode not in self.MODES:
+            raise ValueError(f"Unknown snap mode '{mode}', expected one of: {', '.join(self.MODES)}")
+        self.mode = mode
+        self.keyframes = keyframes
+        self.audio = audio
+
+    def snap(self, t: float, direction: int = 0) -> float:
+        """
+        The clean position for t: the closest one (direction 0), the first at or after
+        t (direction > 0) or the last at or before t (direction < 0). t if none fits.
+        """
+        snapped = None
+        if self.mode == "keyframe" and self.keyframes is not None:
+            if direction > 0:
+                snapped = self.keyframes.next(t)
+            elif direction < 0:
+                snapped = self.keyframes.previous(t)
+            else:
+                snapped = self.keyframes.nearest(t)
+            if snapped is not None and abs(snapped - t) > settings.CUT_SNAP_TOLERANCE:
+                snapped = None
+        elif self.mode == "frame" and self.keyframes is not None:
+            if direction > 0:
+                snapped = self.keyframes.next_frame(t)
+            elif direction < 0:
+                snapped = self.keyframes.previous_frame(t)
+            else:
+                snapped = self.keyframes.nearest_frame(t)
+        elif self.mode == "zero_crossing" and self.audio is not None:
+            snapped = nearest_zero_crossing(self.audio, t, settings.CUT_SNAP_WINDOW, direction)
+        return t if snapped is None else snapped
+
+    def close(self):
+        if self.audio is not None:
+            self.audio.close()
+            self.audio = None
+
+    def snap_suggestions(self, suggestions: List[EditingSuggestion]):
+        """Snaps both edges of every CUT inward, in place (an edge is left alone if snapping would empty the cut)."""
+        for s in suggestions:
+            if s.suggestion_type != SegmentType.CUT:
+                continue
+            start = self.snap(s.start_time, direction=1)
+            if start < s.end_time:
+                s.start_time = start
+            end = self.snap(s.end_time, direction=-1)
+            if end > s.start_time:
+                s.end_time = end
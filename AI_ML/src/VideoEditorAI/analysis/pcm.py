@@ -0,0 +1,146 @@
+import mmap
+import struct
+from typing import Iterator, Optional
+import numpy as np
+
+WAVE_FORMAT_PCM = 0x0001
+WAVE_FORMAT_EXTENSIBLE = 0xFFFE
+
+class PCMReader:
+    """
+    Zero-copy reader for the mono 16-bit PCM WAV files written by AudioProcessor.extract_audio.
+
+    The WAV data chunk is memory-mapped and exposed as an int16 array; nothing is
+    decoded up front. Float samples are produced lazily, one block at a time, so
+    resident memory stays small even for multi-hour recordings.
+    """
+
+    def __init__(self, audio_path: str):
+        self.audio_path = audio_path
+        self._file = open(audio_path, "rb")
+        try:
+            self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # mmap of an empty file
+            self._file.close()
+            raise ValueError(f"Not a WAV file (empty): {audio_path}")
+
+        try:
+            self.sample_rate, self.channels, self.bits_per_sample, data_offset, data_size = self._parse_header()
+        except Exception:
+            self.close()
+            raise
+
+        if self.channels != 1 or self.bits_per_sample != 16:
+            self.close()
+            raise ValueError(
+                f"Unsupported WAV layout ({self.channels} ch, {self.bits_per_sample}-bit); expected mono 16-bit PCM"
+            )
+
+        n_samples = data_size // 2
+        self.samples = np.frombuffer(self._mmap, dtype="<i2", count=n_samples, offset=data_offset)
+
+    def _parse_header(self):
+        mm = self._mmap
+        if len(mm) < 12 or mm[0:4] != b"RIFF" or mm[8:12] != b"WAVE":
+            raise ValueError(f"Not a RIFF/WAVE file: {self.audio_path}")
+
+        fmt = None
+        pos = 12
+        while pos + 8 <= len(mm):
+            chunk_id = mm[pos:pos + 4]
+            chunk_size = struct.unpack_from("<I", mm, pos + 4)[0]
+            body = pos + 8
+            if chunk_id == b"fmt ":
+                audio_format, channels, sample_rate, _, _, bits = struct.unpack_from("<HHIIHH", mm, body)
+                if audio_format not in (WAVE_FORMAT_PCM, WAVE_FORMAT_EXTENSIBLE):
+                    raise ValueError(f"Unsupported WAV encoding (format tag {audio_format:#x})")
+                fmt = (sample_rate, channels, bits)
+            elif chunk_id == b"data":
+                if fmt is None:
+                    raise ValueError("WAV data chunk appears before fmt chunk")
+                # Streamed writers leave the size as 0xFFFFFFFF; clamp to what is actually on disk
+                data_size = min(chunk_size, len(mm) - body)
+                return fmt[0], fmt[1], fmt[2], body, data_size
+            # Chunks are word aligned
+            pos = body + chunk_size + (chunk_size & 1)
+
+        raise ValueError(f"No data chunk found in {self.audio_path}")
+
+    def __len__(self) -> int:
+        return len(self.samples)
+
+    @property
+    def duration(self) -> float:
+        return len(self.samples) / float(self.sample_rate)
+
+    def read(self, start: int, stop: int, dtype=np.float32) -> np.ndarray:
+        """
+        Returns samples [start, stop) as floats in [-1, 1).
+        Indices outside the file are zero padded (matches librosa's centered framing).
+        """
+        out = np.zeros(max(0, stop - start), dtype=dtype)
+        lo = max(start, 0)
+        hi = min(stop, len(self.samples))
+        if lo < hi:
+            np.multiply(self.samples[lo:hi], 1.0 / 32768.0, out=out[lo - start:hi - start], casting="unsafe")
+        return out
+
+    def iter_blocks(self, block_size: int = 1 << 16) -> Iterator[np.ndarray]:
+        """Yields consecutive float32 blocks of at most block_size samples."""
+        for start in range(0, len(self.samples), block_size):
+            yield self.read(start, min(start + block_size, len(self.samples)))
+
+    def frame_rms(self, frame_length: int = 2048, hop_length: int = 512, frames_per_block: int = 1024) -> np.ndarray:
+        """
+        Frame-level RMS computed straight from the mapped buffer.
+        Same framing as librosa.feature.rms(y, frame_length, hop_length, center=True).
+        """
+        n_frames = 1 + len(self.samples) // hop_length
+        half = frame_length // 2
+        rms = np.empty(n_frames, dtype=np.float32)
+
+        for f0 in range(0, n_frames, frames_per_block):
+            f1 = min(n_frames, f0 + frames_per_block)
+            lo = f0 * hop_length - half
+            hi = (f1 - 1) * hop_length - half + frame_length
+
+            # float64 keeps the running sum exact enough over a block
+            block = self.read(lo, hi, dtype=np.float64)
+            cumsum = np.empty(len(block) + 1)
+            cumsum[0] = 0.0
+            np.cumsum(np.square(block, out=block), out=cumsum[1:])
+
+            frame_starts = np.arange(f1 - f0) * hop_length
+            power = (cumsum[frame_starts + frame_length] - cumsum[frame_starts]) / frame_length
+            rms[f0:f1] = np.sqrt(np.maximum(power, 0.0))
+
+        return rms
+
+    def close(self):
+        self.samples = None
+        if self._mmap is not None:
+            try:
+                self._mmap.close()
+            except BufferError:
+                # Someone still holds a view of the samples; let GC release the mapping
+                pass
+            self._mmap = None
+        self._file.close()
+
+    def __enter__(self) -> "PCMReader":
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+def open_pcm(audio_path: str, sample_rate: Optional[int] = None) -> Optional[PCMReader]:
+    """Opens audio_path with PCMReader, or returns None if it isn't mono 16-bit PCM at sample_rate."""
+    try:
+        reader = PCMReader(audio_path)
+    except (ValueError, struct.error):
+        return None
+    if sample_rate is not None and reader.sample_rate != sample_rate:
+        reader.close()
+        return None
+    return reader
@@ -1,56 +1,150 @@
+import threading
 from sentence_transformers import SentenceTransformer
-from sklearn.metrics.pairwise import cosine_similarity
 import numpy as np
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 from VideoEditorAI.core.config import settings
-from VideoEditorAI.core.models import VideoSegment
+from VideoEditorAI.core.models import SegmentTable
+from VideoEditorAI.core.registry import ModelRegistry
 
 class SemanticAnalyzer:
-    def __init__(self):
-        print(f"Loading Sentence Transformer ({settings.EMBEDDING_MODEL})...")
-        self.model = SentenceTransformer(settings.EMBEDDING_MODEL)
+    def __init__(self, model_name: Optional[str] = None, registry: Optional[ModelRegistry] = None):
+        self.model_name = model_name or settings.EMBEDDING_MODEL
+        self.backend = settings.EMBEDDING_BACKEND
+        if registry is None:
+            self.model = self._load_model(self.model_name)
+        else:
+            self.model = registry.get(
+                "embedding", f"{self.model_name}:{self.backend}", lambda: self._load_model(self.model_name)
+            )
+
+    def _load_model(self, model_name: str) -> SentenceTransformer:
+        print(f"Loading Sentence Transformer ({model_name}, backend={self.backend})...")
+        if self.backend == "onnx":
+            try:
+                # Needs sentence-transformers >= 3.2 and optimum[onnxruntime]
+                return SentenceTransformer(model_name, backend="onnx")
+            except Exception as e:
+                print(f"[DEBUG] ONNX backend unavailable ({e}), falling back to torch.")
+                self.backend = "torch"
 
-    def analyze_segments(self, segments: List[Dict[str, Any]]) -> List[VideoSegment]:
+        model = SentenceTransformer(model_name)
+        if self.backend == "int8":
+            import torch
+            # int8 weights for every Linear layer, activations quantized on the fly (CPU only)
+            torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8, inplace=True)
+        return model
+
+    def encode_texts(self, texts: List[str]) -> np.ndarray:
+        """
+        Encodes texts in batches of similar token length, so each batch pads to
+        roughly its own length instead of the longest text overall.
+        Returns an (n, dim) matrix in the original order, in EMBEDDING_DTYPE.
+        """
+        n = len(texts)
+        dtype = np.float16 if settings.EMBEDDING_DTYPE == "float16" else np.float32
+        embeddings = np.empty((n, self.model.get_sentence_embedding_dimension()), dtype=dtype)
+        if n == 0:
+            return embeddings
+
+        order = np.argsort(self._token_lengths(texts), kind="stable")
+        batch_size = max(1, settings.EMBEDDING_BATCH_SIZE)
+
+        with _torch_threads(settings.EMBEDDING_THREADS):
+            for i in range(0, n, batch_size):
+                idx = order[i:i + batch_size]
+                embeddings[idx] = self.model.encode(
+                    [texts[j] for j in idx],
+                    batch_size=len(idx),
+                    convert_to_numpy=True,
+                    normalize_embeddings=settings.EMBEDDING_NORMALIZE,
+                    show_progress_bar=False
+                )
+        return embeddings
+
+    def _token_lengths(self, texts: List[str]) -> List[int]:
+        tokenizer = getattr(self.model, "tokenizer", None)
+        if tokenizer is None:
+            return [len(t) for t in texts]
+        encoded = tokenizer(texts, add_special_tokens=True, truncation=True, max_length=self.model.max_seq_length)
+        return [len(ids) for ids in encoded["input_ids"]]
+
+    def analyze_segments(self, segments: List[Dict[str, Any]]) -> SegmentTable:
         """
         Enriches transcript segments with embeddings and detects redundancies.
-        Returns a list of VideoSegment objects.
+        Returns a columnar SegmentTable (one embedding matrix, no per-segment objects).
         """
         if not segments:
-            return []
+            return SegmentTable.empty()
 
         texts = [s["text"].strip() for s in segments]
-        embeddings = self.model.encode(texts)
-        
-        video_segments = []
-        for i, s in enumerate(segments):
-            seg = VideoSegment(
-                start_time=s["start"],
-                end_time=s["end"],
-                text=s["text"],
-                semantic_embedding=embeddings[i]
-            )
-            video_segments.append(seg)
-            
-        return video_segments
+        # Written straight into one (n, dim) matrix; the table keeps it as-is
+        embeddings = self.encode_texts(texts)
+
+        return SegmentTable.from_transcript(segments, embeddings)
 
-    def find_redundancies(self, video_segments: List[VideoSegment]) -> List[tuple]:
+    def find_redundancies(self, table: SegmentTable, block_size: int = 1024) -> List[tuple]:
         """
         Finds pairs of segments that are semantically similar.
         Returns list of (index1, index2) where index2 is redundant to index1.
         """
-        redundancies = []
-        n = len(video_segments)
+        n = len(table)
         if n < 2:
-            return redundancies
-
-        embeddings = np.array([s.semantic_embedding for s in video_segments])
-        sim_matrix = cosine_similarity(embeddings)
-        
-        # Check upper triangle
-        for i in range(n):
-            for j in range(i + 1, n):
-                if sim_matrix[i][j] > settings.SIMILARITY_THRESHOLD:
-                    # Mark the shorter or later one as potential redundancy
-                    redundancies.append((i, j))
-                    
+            return []
+
+        # Cosine similarity, a block of rows at a time so the full n x n matrix
+        # never exists (float16 tables are upcast once, numpy has no fast fp16 matmul)
+        embeddings = table.embeddings.astype(np.float32, copy=False)
+        norms = np.linalg.norm(embeddings, axis=1)
+        norms[norms == 0] = 1.0
+
+        redundancies = []
+        for i0 in range(0, n, block_size):
+            i1 = min(n, i0 + block_size)
+            sims = embeddings[i0:i1] @ embeddings[i0:].T
+            sims /= norms[i0:i1, None]
+            sims /= norms[None, i0:]
+
+            # Upper triangle only (j > i), in the same row-major order as a nested loop.
+            # The later one of each pair is marked as the potential redundancy.
+            rows, cols = np.nonzero(np.triu(sims > settings.SIMILARITY_THRESHOLD, k=1))
+            redundancies.extend(zip((rows + i0).tolist(), (cols + i0).tolist()))
+
         return redundancies
+
+class _torch_threads:
+    """
+    Sets torch's intra-op thread count while any encode is running (0 leaves it unchanged).
+
+    The setting is process-wide and requests encode concurrently in the threadpool,
+    so it is reference counted: the first encode to start saves the current value
+    (e.g. the per-worker count from serve.py) and the last one to finish restores it.
+    """
+
+    _lock = threading.Lock()
+    _active = 0
+    _saved: Optional[int] = None
+
+    def __init__(self, threads: int):
+        self.threads = threads
+
+    def __enter__(self):
+        if self.threads <= 0:
+            return
+        import torch
+        cls = type(self)
+        with cls._lock:
+            if cls._active == 0:
+                cls._saved = torch.get_num_threads()
+                torch.set_num_threads(self.threads)
+            cls._active += 1
+
+    def __exit__(self, exc_type, exc, tb):
+        if self.threads <= 0:
+            return
+        import torch
+        cls = type(self)
+        with cls._lock:
+            cls._active -= 1
+            if cls._active == 0:
+                torch.set_num_threads(cls._saved)
+                cls._saved = None
@@ -1,11 +1,28 @@
 import whisper
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 from VideoEditorAI.core.config import settings
+from VideoEditorAI.core.registry import ModelRegistry
 
 class Transcriber:
-    def __init__(self):
-        print(f"Loading Whisper model ({settings.WHISPER_MODEL_SIZE})...")
-        self.model = whisper.load_model(settings.WHISPER_MODEL_SIZE)
+    def __init__(
+        self,
+        model_name: Optional[str] = None,
+        registry: Optional[ModelRegistry] = None,
+        beam_size: int = 1,
+        word_timestamps: Optional[bool] = None
+    ):
+        self.model_name = model_name or settings.WHISPER_MODEL_SIZE
+        self.beam_size = beam_size
+        self.word_timestamps = settings.WORD_TIMESTAMPS if word_timestamps is None else word_timestamps
+        if registry is None:
+            self.model = self._load_model()
+        else:
+            # Shared with every other request using the same Whisper size
+            self.model = registry.get("whisper", self.model_name, self._load_model)
+
+    def _load_model(self):
+        print(f"Loading Whisper model ({self.model_name})...")
+        return whisper.load_model(self.model_name)
 
     def transcribe(self, audio_path: str) -> Dict[str, Any]:
         """
@@ -16,8 +33,11 @@ class Transcriber:
         
         # verbose=False to suppress default whisper printing
         # fp16=False to supress CPU warning
-        # beam_size=1 for maximum speed (greedy decoding)
-        result = self.model.transcribe(audio_path, verbose=False, fp16=False, beam_size=1)
+        # beam_size=1 for maximum speed (greedy decoding), larger in the accurate profile
+        # word_timestamps adds a "words" list (word, start, end, probability) to every segment
+        result = self.model.transcribe(
+            audio_path, verbose=False, fp16=False, beam_size=self.beam_size, word_timestamps=self.word_timestamps
+        )
         
         # Access language if available (Whisper usually determines this early)
         language = result.get("language", "unknown")
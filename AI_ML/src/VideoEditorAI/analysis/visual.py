@@ -0,0 +1,115 @@
+import re
+import subprocess
+from functools import lru_cache
+from typing import List, Tuple
+import numpy as np
+from VideoEditorAI.core.config import settings
+
+PTS_TIME_RE = re.compile(rb"pts_time:\s*(-?[0-9.]+(?:[eE][-+]?[0-9]+)?)")
+
+@lru_cache(maxsize=None)
+def passthrough_args() -> Tuple[str, ...]:
+    """
+    Output options that keep every decoded frame with its own timestamp.
+    -fps_mode only exists since ffmpeg 5.1; older builds (e.g. Ubuntu 22.04's 4.4)
+    only know -vsync, which newer ones still accept but flag as deprecated.
+    """
+    try:
+        result = subprocess.run(["ffmpeg", "-hide_banner", "-h", "long"], capture_output=True, text=True)
+        if "-fps_mode" in result.stdout:
+            return ("-fps_mode", "passthrough")
+    except OSError:
+        pass
+    return ("-vsync", "passthrough")
+
+class SceneDetector:
+    """
+    Finds visual scene changes from a tiny grayscale thumbnail stream.
+
+    A single ffmpeg process decodes only keyframes (or frames sampled at a low fixed
+    rate) scaled down to SCENE_FRAME_WIDTH x SCENE_FRAME_HEIGHT, and the frame
+    differences are scored with vectorized NumPy. Decoding keyframes only is far
+    faster than real time, and encoders usually place a keyframe on a hard cut.
+    """
+
+    def __init__(self):
+        self.width = settings.SCENE_FRAME_WIDTH
+        self.height = settings.SCENE_FRAME_HEIGHT
+        self.histogram_bins = 32
+
+    def read_frames(self, video_path: str, mode: str = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Returns (times, frames): presentation times in seconds and a uint8 array of
+        shape (n_frames, height * width).
+        mode is "keyframes" or "sample" (SCENE_SAMPLE_FPS frames per second).
+        """
+        mode = mode or settings.SCENE_DETECTION_MODE
+        filters = [f"scale={self.width}:{self.height}:flags=fast_bilinear", "format=gray", "showinfo"]
+        command = ["ffmpeg", "-hide_banner", "-nostats"]
+        if mode == "keyframes":
+            command += ["-skip_frame", "nokey"]
+        else:
+            filters.insert(0, f"fps={settings.SCENE_SAMPLE_FPS}")
+        command += [
+            "-i", video_path,
+            "-map", "0:v:0",
+            "-an", "-sn",
+            "-vf", ",".join(filters),
+            *passthrough_args(),
+            "-f", "rawvideo",
+            "pipe:1"
+        ]
+
+        # showinfo prints each frame's pts_time on stderr; pixels go to stdout
+        proc = subprocess.run(command, capture_output=True, check=True)
+        frame_size = self.width * self.height
+        n_frames = len(proc.stdout) // frame_size
+        frames = np.frombuffer(proc.stdout, dtype=np.uint8, count=n_frames * frame_size).reshape(n_frames, frame_size)
+        times = np.array([float(t) for t in PTS_TIME_RE.findall(proc.stderr)], dtype=np.float64)
+
+        n = min(len(times), n_frames)
+        return times[:n], frames[:n]
+
+    def scene_scores(self, frames: np.ndarray) -> np.ndarray:
+        """
+        Change score in [0, 1] between each frame and the previous one (length n - 1):
+        the mean of the gray-histogram distance and the mean absolute pixel difference.
+        """
+        n = len(frames)
+        if n < 2:
+            return np.zeros(0)
+
+        bins = self.histogram_bins
+        shift = 8 - int(np.log2(bins))
+        # One bincount for all frames: offset each frame's bin indices by frame * bins
+        bin_idx = (frames >> shift).astype(np.int64) + (np.arange(n, dtype=np.int64) * bins)[:, None]
+        hist = np.bincount(bin_idx.ravel(), minlength=n * bins).reshape(n, bins) / frames.shape[1]
+        hist_diff = 0.5 * np.abs(np.diff(hist, axis=0)).sum(axis=1)
+
+        pixel_diff = np.abs(np.diff(frames.astype(np.int16), axis=0)).mean(axis=1) / 255.0
+
+        return 0.5 * hist_diff + 0.5 * pixel_diff
+
+    def detect_scenes(self, video_path: str) -> List[float]:
+        """Returns the times (seconds) at which a new scene starts."""
+        try:
+            times, frames = self.read_frames(video_path)
+        except subprocess.CalledProcessError as e:
+            # No video stream, or an ffmpeg that can't run the command: the analysis
+            # goes on without scenes, but say why (ffmpeg's last error line)
+            lines = (e.stderr or b"").decode("utf-8", "replace").strip().splitlines()
+            print(f"WARNING:ai.visual_analysis:Scene detection skipped, ffmpeg failed: {lines[-1] if lines else e}")
+            return []
+        except FileNotFoundError:
+            print("WARNING:ai.visual_analysis:Scene detection skipped, ffmpeg not found.")
+            return []
+
+        scores = self.scene_scores(frames)
+        boundaries = []
+        for i in np.flatnonzero(scores > settings.SCENE_THRESHOLD):
+            t = float(times[i + 1])
+            if not boundaries or t - boundaries[-1] >= settings.SCENE_MIN_GAP:
+                boundaries.append(t)
+
+        print(f"INFO:ai.visual_analysis:Scanned {len(frames)} frames, found {len(boundaries)} scene changes.")
+        return boundaries
@@ -0,0 +1,102 @@
+import os
+import struct
+from typing import List, Dict, Any, Optional
+import numpy as np
+from VideoEditorAI.core.config import settings
+from VideoEditorAI.analysis.pcm import PCMReader
+
+# waveform.bin layout (little endian):
+#   header  "WAVP" | version u16 | level count u16 | sample rate u32 | total samples u64
+#   levels  per level: samples per bin u32 | bin count u32 | data offset u64 | data length u64
+#   data    per level: bin_count x (min i16, max i16, rms i16), levels back to back
+WAVEFORM_FILE = "waveform.bin"
+MAGIC = b"WAVP"
+VERSION = 1
+HEADER = struct.Struct("<4sHHIQ")
+LEVEL = struct.Struct("<IIQQ")
+BIN_BYTES = 6
+
+def _level0(samples: np.ndarray, samples_per_bin: int, bins_per_block: int = 4096) -> np.ndarray:
+    """min/max/rms of every samples_per_bin samples, read block by block from the mapped file."""
+    n_bins = (len(samples) + samples_per_bin - 1) // samples_per_bin
+    out = np.empty((n_bins, 3), dtype="<i2")
+    block = samples_per_bin * bins_per_block
+
+    for b0 in range(0, n_bins, bins_per_block):
+        chunk = samples[b0 * samples_per_bin:b0 * samples_per_bin + block]
+        full = len(chunk) // samples_per_bin
+        bins = chunk[:full * samples_per_bin].reshape(full, samples_per_bin)
+        rows = out[b0:b0 + full]
+        rows[:, 0] = bins.min(axis=1)
+        rows[:, 1] = bins.max(axis=1)
+        squares = np.square(bins, dtype=np.float64)
+        rows[:, 2] = np.minimum(np.sqrt(squares.mean(axis=1)), 32767)
+
+        tail = chunk[full * samples_per_bin:]
+        if len(tail):
+            # Last, partial bin of the file
+            out[b0 + full] = (tail.min(), tail.max(), min(np.sqrt(np.square(tail, dtype=np.float64).mean()), 32767))
+    return out
+
+def _coarsen(level: np.ndarray, factor: int) -> np.ndarray:
+    """Merges every `factor` bins: min of mins, max of maxes, quadratic mean of the RMS values."""
+    n = (len(level) + factor - 1) // factor
+    pad = n * factor - len(level)
+    mins = np.pad(level[:, 0], (0, pad), mode="edge").reshape(n, factor).min(axis=1)
+    maxs = np.pad(level[:, 1], (0, pad), mode="edge").reshape(n, factor).max(axis=1)
+    power = np.pad(np.square(level[:, 2], dtype=np.float64), (0, pad), mode="edge").reshape(n, factor).mean(axis=1)
+    return np.stack([mins, maxs, np.minimum(np.sqrt(power), 32767)], axis=1).astype("<i2")
+
+def build_waveform(audio_path: str, output_path: str) -> Dict[str, Any]:
+    """
+    Writes a min/max/RMS waveform pyramid of a mono 16-bit WAV to output_path.
+    Level 0 has WAVEFORM_SAMPLES_PER_BIN samples per bin; each further level is
+    WAVEFORM_LEVEL_FACTOR times coarser, down to about WAVEFORM_MIN_BINS bins.
+    Returns the file's index (see read_index).
+    """
+    factor = max(2, settings.WAVEFORM_LEVEL_FACTOR)
+    with PCMReader(audio_path) as reader:
+        sample_rate, total = reader.sample_rate, len(reader)
+        samples_per_bin = settings.WAVEFORM_SAMPLES_PER_BIN
+        levels = [(samples_per_bin, _level0(reader.samples, samples_per_bin))]
+
+    while len(levels[-1][1]) > settings.WAVEFORM_MIN_BINS:
+        spb, data = levels[-1]
+        levels.append((spb * factor, _coarsen(data, factor)))
+
+    offset = HEADER.size + LEVEL.size * len(levels)
+    table = []
+    for spb, data in levels:
+        table.append((spb, len(data), offset, len(data) * BIN_BYTES))
+        offset += len(data) * BIN_BYTES
+
+    # Write-then-rename so readers never see a half-written file
+    tmp_path = output_path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, VERSION, len(levels), sample_rate, total))
+        for entry in table:
+            f.write(LEVEL.pack(*entry))
+        for _, data in levels:
+            f.write(data.tobytes())
+    os.replace(tmp_path, output_path)
+
+    print(f"INFO:ai.audio_analysis:Waveform written ({len(levels)} levels, {offset / 1024:.0f} KB).")
+    return read_index(output_path)
+
+def read_index(path: str) -> Dict[str, Any]:
+    """Header of a waveform file: sample rate, sample count and the byte range of every level."""
+    with open(path, "rb") as f:
+        magic, version, n_levels, sample_rate, total = HEADER.unpack(f.read(HEADER.size))
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"Not a waveform file (or unsupported version): {path}")
+        levels: List[Dict[str, int]] = []
+        for level in range(n_levels):
+            spb, bins, offset, length = LEVEL.unpack(f.read(LEVEL.size))
+            levels.append({"level": level, "samples_per_bin": spb, "bins": bins, "offset": offset, "length": length})
+    return {"sample_rate": sample_rate, "total_samples": total, "levels": levels}
+
+def read_level(path: str, level: int, index: Optional[Dict[str, Any]] = None) -> np.ndarray:
+    """One level as a (bins, 3) int16 array of min, max, rms."""
+    info = (index or read_index(path))["levels"][level]
+    data = np.fromfile(path, dtype="<i2", count=info["length"] // 2, offset=info["offset"])
+    return data.reshape(-1, 3)
@@ -0,0 +1,165 @@
+import asyncio
+import heapq
+import itertools
+import math
+import os
+import time
+from contextlib import asynccontextmanager
+from typing import Dict, Any, Optional
+from VideoEditorAI.core.config import settings
+
+class AdmissionRejected(Exception):
+    """Raised when the wait queue is full. retry_after is a hint in whole seconds."""
+
+    def __init__(self, retry_after: int):
+        super().__init__(f"Server is busy, retry in {retry_after}s")
+        self.retry_after = retry_after
+
+class AdmissionController:
+    """
+    Cost-based admission control for analysis jobs.
+
+    A job's cost is estimated from its media duration (CPU-seconds per second of
+    media). Jobs run while the total cost in flight fits the CPU budget; the rest
+    wait in a queue ordered by cost, so short clips go first. A queued job's cost
+    counts ADMISSION_AGING less for every second it has waited, so a long video
+    is not starved by a steady stream of short clips. When the queue is full new
+    jobs are rejected with a retry-after estimate.
+
+    The budget and queue are per process: with `serve.py --workers N` each worker
+    admits up to the full budget.
+    """
+
+    def __init__(
+        self,
+        cpu_budget: Optional[float] = None,
+        cost_per_media_second: Optional[float] = None,
+        max_queue: Optional[int] = None,
+        aging: Optional[float] = None,
+    ):
+        self.cpu_count = os.cpu_count() or 1
+        self.cpu_budget = cpu_budget or settings.ADMISSION_CPU_BUDGET or self.cpu_count * 120.0
+        self.cost_per_media_second = cost_per_media_second or settings.ADMISSION_COST_PER_MEDIA_SECOND
+        self.max_queue = settings.ADMISSION_MAX_QUEUE if max_queue is None else max_queue
+        self.aging = settings.ADMISSION_AGING if aging is None else aging
+
+        self._in_flight_cost = 0.0
+        self._running = 0
+        self._queue = []  # heap of (priority, seq, cost, future)
+        self._waiting = 0
+        self._queued_cost = 0.0
+        self._seq = itertools.count()
+        self._admitted_total = 0
+        self._rejected_total = 0
+
+    def estimate_cost(self, duration: float) -> float:
+        """Estimated CPU-seconds for analysing `duration` seconds of media."""
+        # Unknown duration (ffprobe failed) is treated as an average-sized job
+        if duration <= 0:
+            duration = settings.ADMISSION_DEFAULT_DURATION
+        return max(settings.ADMISSION_MIN_COST, duration * self.cost_per_media_second)
+
+    def retry_after(self) -> int:
+        """Rough seconds until the current backlog drains, assuming all cores are busy."""
+        outstanding = self._in_flight_cost + self._queued_cost
+        return max(1, math.ceil(outstanding / self.cpu_count))
+
+    @asynccontextmanager
+    async def admit(self, duration: float):
+        """Waits until the job may run; raises AdmissionRejected if the queue is full."""
+        cost = await self.acquire(duration)
+        try:
+            yield cost
+        finally:
+            self.release(cost)
+
+    async def acquire(self, duration: float) -> float:
+        """
+        Like admit(), for jobs that outlive the request handler (e.g. streamed
+        responses). Returns the job's cost, to be passed to release().
+        """
+        cost = self.estimate_cost(duration)
+        await self._acquire(cost)
+        return cost
+
+    def release(self, cost: float):
+        self._release(cost)
+
+    def _priority(self, cost: float) -> float:
+        # The aged cost, cost - aging * (now - enqueued), orders jobs the same way as
+        # cost + aging * enqueued, which doesn't change while waiting: a valid heap key
+        return cost + self.aging * time.monotonic()
+
+    def _fits(self, cost: float) -> bool:
+        # A job bigger than the whole budget still runs, alone
+        return self._running == 0 or self._in_flight_cost + cost <= self.cpu_budget
+
+    async def _acquire(self, cost: float):
+        # Run now unless a cheaper (or long-waiting) job is already queued
+        priority = self._priority(cost)
+        if self._fits(cost) and not self._higher_priority_waiting(priority):
+            self._start(cost)
+            return
+
+        if self._waiting >= self.max_queue:
+            self._rejected_total += 1
+            raise AdmissionRejected(self.retry_after())
+
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._queue, (priority, next(self._seq), cost, future))
+        self._waiting += 1
+        self._queued_cost += cost
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.cancelled():
+                # Still queued: drop it (the heap entry is skipped lazily)
+                self._waiting -= 1
+                self._queued_cost -= cost
+            else:
+                # Admitted right as the client went away: give the slot back
+                self._release(cost)
+            raise
+
+    def _higher_priority_waiting(self, priority: float) -> bool:
+        while self._queue and self._queue[0][3].cancelled():
+            heapq.heappop(self._queue)
+        return bool(self._queue) and self._queue[0][0] <= priority
+
+    def _start(self, cost: float):
+        self._in_flight_cost += cost
+        self._running += 1
+        self._admitted_total += 1
+
+    def _release(self, cost: float):
+        self._in_flight_cost = max(0.0, self._in_flight_cost - cost)
+        self._running -= 1
+        self._dispatch()
+
+    def _dispatch(self):
+        while self._queue:
+            _, _, cost, future = self._queue[0]
+            if future.cancelled():
+                heapq.heappop(self._queue)
+                continue
+            # The head waits for room rather than letting smaller jobs past it,
+            # so once a big job has aged to the front it is guaranteed to run
+            if not self._fits(cost):
+                break
+            heapq.heappop(self._queue)
+            self._waiting -= 1
+            self._queued_cost -= cost
+            self._start(cost)
+            future.set_result(True)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "cpu_budget": self.cpu_budget,
+            "in_flight_cost": round(self._in_flight_cost, 1),
+            "running": self._running,
+            "queued": self._waiting,
+            "queued_cost": round(self._queued_cost, 1),
+            "max_queue": self.max_queue,
+            "admitted_total": self._admitted_total,
+            "rejected_total": self._rejected_total,
+        }
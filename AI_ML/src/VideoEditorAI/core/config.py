@@ -9,9 +9,36 @@ class Config:
     
     # NLP / Semantic
     WHISPER_MODEL_SIZE: str = "base"
+    WORD_TIMESTAMPS: bool = False  # per-word times/probabilities in the stored transcript (slower)
     EMBEDDING_MODEL: str = "all-MiniLM-L6-v2"
     SIMILARITY_THRESHOLD: float = 0.85  # For detecting redundancy
+    EMBEDDING_BACKEND: str = "torch"  # "torch", "int8" (dynamically quantized) or "onnx"
+    EMBEDDING_BATCH_SIZE: int = 64  # texts per batch, batches are grouped by token length
+    EMBEDDING_THREADS: int = 0  # torch threads while encoding, 0 -> torch default
+    EMBEDDING_DTYPE: str = "float32"  # "float32" or "float16" storage for the embedding matrix
+    EMBEDDING_NORMALIZE: bool = True  # unit-length embeddings
     
+    # Waveform pyramid for timeline drawing (min/max/RMS per bin)
+    WAVEFORM: bool = True
+    WAVEFORM_SAMPLES_PER_BIN: int = 256  # level 0, ~11.6 ms at 22050 Hz
+    WAVEFORM_LEVEL_FACTOR: int = 4  # each level is this much coarser than the previous one
+    WAVEFORM_MIN_BINS: int = 1024  # stop adding levels once one has this few bins
+
+    # Visual Analysis (scene changes)
+    SCENE_DETECTION: bool = True
+    SCENE_DETECTION_MODE: str = "keyframes"  # "keyframes" or "sample"
+    SCENE_SAMPLE_FPS: float = 2.0  # used by "sample" mode
+    SCENE_FRAME_WIDTH: int = 64
+    SCENE_FRAME_HEIGHT: int = 36
+    SCENE_THRESHOLD: float = 0.35  # change score (0-1) that counts as a cut
+    SCENE_MIN_GAP: float = 1.0  # seconds between two scene boundaries
+    SCENE_SNAP_TOLERANCE: float = 0.5  # cut edges this close to a scene change snap onto it
+    
+    # Cut boundary snapping: "none", "keyframe", "frame" or "zero_crossing"
+    CUT_SNAP: str = "none"
+    CUT_SNAP_TOLERANCE: float = 1.0  # "keyframe": max seconds an edge may move
+    CUT_SNAP_WINDOW: float = 0.02  # "zero_crossing": search this many seconds inward
+
     # Heuristics
     MIN_SEGMENT_DURATION: float = 1.0
     CONFIDENCE_THRESHOLD: float = 0.6
@@ -24,6 +51,38 @@ class Config:
     TEMP_DIR: str = os.path.join(os.getcwd(), "temp")
     OUTPUT_DIR: str = os.path.join(os.getcwd(), "output")
 
+    # Scratch workspace (per-job directories for extracted audio etc.)
+    SCRATCH_DIR: str = ""  # empty -> TEMP_DIR/jobs
+    SCRATCH_USE_TMPFS: bool = False  # keep scratch files in /dev/shm when available
+    SCRATCH_QUOTA_MB: int = 4096  # 0 disables the quota
+
+    # Serving (serve.py: models loaded once, shared by forked workers)
+    SERVE_WORKERS: int = 2
+    TORCH_THREADS_PER_WORKER: int = 0  # 0 -> CPU count / workers
+
+    # Admission control for /analyze (per server process)
+    ADMISSION_CPU_BUDGET: float = 0.0  # CPU-seconds of work in flight; 0 -> 120 per core
+    ADMISSION_COST_PER_MEDIA_SECOND: float = 1.0  # estimated CPU-seconds per second of media
+    ADMISSION_MIN_COST: float = 5.0
+    ADMISSION_DEFAULT_DURATION: float = 300.0  # assumed when ffprobe can't read the duration
+    ADMISSION_MAX_QUEUE: int = 16
+    ADMISSION_AGING: float = 1.0  # cost a queued job gains in priority per second waited; 0 -> strictly shortest first
+
+    # Resumable chunked uploads
+    UPLOAD_CHUNK_SIZE_MB: int = 8  # default chunk size suggested to clients
+    UPLOAD_MAX_CHUNK_MB: int = 64
+    UPLOAD_MIN_CHUNK_KB: int = 256  # only the last chunk may be smaller
+    UPLOAD_MAX_SIZE_MB: int = 20480  # largest upload accepted (20 GB)
+    UPLOAD_TTL_HOURS: float = 24.0  # unfinished uploads are deleted after this
+
+    # Pipeline profiles (core/profiles.py: "fast", "balanced", "accurate") and model sharing
+    DEFAULT_PROFILE: str = "balanced"  # preloaded at startup, used when a request names none
+    MODEL_MEMORY_BUDGET_MB: int = 4096  # loaded models beyond this are evicted LRU first, 0 = no limit
+
+    # Profiling (per analysis run; also enabled per request with the X-Profile header)
+    PROFILE_REQUESTS: bool = False
+    PROFILE_TOP_FUNCTIONS: int = 40  # functions listed in the saved report
+
     def __post_init__(self):
         os.makedirs(self.TEMP_DIR, exist_ok=True)
         os.makedirs(self.OUTPUT_DIR, exist_ok=True)
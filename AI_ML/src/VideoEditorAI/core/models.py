@@ -1,6 +1,7 @@
 from dataclasses import dataclass, field
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Iterator
 from enum import Enum
+import numpy as np
 
 class SegmentType(str, Enum):
     CUT = "cut"
@@ -18,6 +19,99 @@ class VideoSegment:
     is_silent: bool = False
     semantic_embedding: Any = None  # numpy array, valid type Any for simplicity here
 
+class SegmentRow:
+    """Lightweight read-only view of one row of a SegmentTable.
+
+    Exposes the same attribute names as VideoSegment so existing callers
+    (e.g. the decision engine) can keep using `seg.start_time`, `seg.text`...
+    """
+    __slots__ = ("_table", "_index")
+
+    def __init__(self, table: "SegmentTable", index: int):
+        self._table = table
+        self._index = index
+
+    @property
+    def start_time(self) -> float:
+        return float(self._table.starts[self._index])
+
+    @property
+    def end_time(self) -> float:
+        return float(self._table.ends[self._index])
+
+    @property
+    def text(self) -> Optional[str]:
+        return self._table.texts[self._index]
+
+    @property
+    def semantic_embedding(self) -> Any:
+        # A view into the embedding matrix, not a copy
+        return self._table.embeddings[self._index]
+
+    @property
+    def audio_energy(self) -> float:
+        return 0.0
+
+    @property
+    def is_silent(self) -> bool:
+        return False
+
+    def __repr__(self) -> str:
+        return f"SegmentRow({self.start_time:.2f}-{self.end_time:.2f}, {self.text!r})"
+
+class SegmentTable:
+    """Columnar storage for transcript segments.
+
+    Holds start/end times as float arrays, the texts as a list and all
+    embeddings as one contiguous float32 (or float16) matrix (n_segments x dim), so long
+    transcripts don't allocate one object and one array per segment.
+    """
+    __slots__ = ("starts", "ends", "texts", "embeddings")
+
+    def __init__(self, starts: np.ndarray, ends: np.ndarray, texts: List[str], embeddings: Optional[np.ndarray] = None):
+        self.starts = np.asarray(starts, dtype=np.float64)
+        self.ends = np.asarray(ends, dtype=np.float64)
+        self.texts = texts
+        if embeddings is None:
+            embeddings = np.empty((len(texts), 0), dtype=np.float32)
+        # No-op when the encoder already returned a C-contiguous float32/float16 matrix
+        dtype = np.float16 if embeddings.dtype == np.float16 else np.float32
+        self.embeddings = np.ascontiguousarray(embeddings, dtype=dtype)
+
+        if not (len(self.starts) == len(self.ends) == len(self.texts) == len(self.embeddings)):
+            raise ValueError("SegmentTable columns must all have the same length")
+
+    @classmethod
+    def empty(cls) -> "SegmentTable":
+        return cls(np.empty(0), np.empty(0), [])
+
+    @classmethod
+    def from_transcript(cls, segments: List[Dict[str, Any]], embeddings: Optional[np.ndarray] = None) -> "SegmentTable":
+        """Builds a table from Whisper-style segment dicts ('start', 'end', 'text')."""
+        starts = np.fromiter((s["start"] for s in segments), dtype=np.float64, count=len(segments))
+        ends = np.fromiter((s["end"] for s in segments), dtype=np.float64, count=len(segments))
+        texts = [s["text"] for s in segments]
+        return cls(starts, ends, texts, embeddings)
+
+    def __len__(self) -> int:
+        return len(self.texts)
+
+    def __getitem__(self, index: int) -> SegmentRow:
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("SegmentTable index out of range")
+        return SegmentRow(self, index)
+
+    def __iter__(self) -> Iterator[SegmentRow]:
+        for i in range(len(self)):
+            yield SegmentRow(self, i)
+
+    def overlapping(self, start: float, end: float) -> np.ndarray:
+        """Indices of segments that overlap the (start, end) range, in order."""
+        mask = np.maximum(self.starts, start) < np.minimum(self.ends, end)
+        return np.flatnonzero(mask)
+
 @dataclass
 class EditingSuggestion:
     """A concrete suggestion for an edit."""
@@ -27,9 +121,12 @@ class EditingSuggestion:
     confidence: float
     reason: str
     metadata: Dict[str, Any] = field(default_factory=dict)
+    suggestion_id: str = ""  # stable across re-computations, set by DecisionEngine
+    origin: str = ""  # the rule and input it came from (e.g. "silence:5.06-7.96"), what suggestion_id is derived from
 
     def to_dict(self) -> Dict[str, Any]:
         return {
+            "id": self.suggestion_id,
             "type": self.suggestion_type.value,
             "start": round(float(self.start_time), 2),
             "end": round(float(self.end_time), 2),
@@ -37,6 +134,30 @@ class EditingSuggestion:
             "reason": self.reason
         }
 
+    def to_record(self) -> Dict[str, Any]:
+        """Full-precision form used for saved analyses (to_dict() is rounded for display)."""
+        return {
+            "id": self.suggestion_id,
+            "type": self.suggestion_type.value,
+            "start": float(self.start_time),
+            "end": float(self.end_time),
+            "confidence": float(self.confidence),
+            "reason": self.reason,
+            "metadata": self.metadata
+        }
+
+    @classmethod
+    def from_record(cls, record: Dict[str, Any]) -> "EditingSuggestion":
+        return cls(
+            suggestion_type=SegmentType(record["type"]),
+            start_time=record["start"],
+            end_time=record["end"],
+            confidence=record["confidence"],
+            reason=record["reason"],
+            metadata=record.get("metadata", {}),
+            suggestion_id=record.get("id", "")
+        )
+
 @dataclass
 class AnalysisResult:
     """Container for all analysis data and final suggestions."""
@@ -46,6 +167,10 @@ class AnalysisResult:
     transcript: List[Dict[str, Any]]
     silence_segments: List[tuple]
     suggestions: List[EditingSuggestion]
+    analysis_id: str = ""
+    media_info: Dict[str, Any] = field(default_factory=dict)  # fps, width, height, codec of the video stream
+    profile: str = ""  # pipeline profile the analysis ran with
+    source_name: str = ""  # the file name the user uploaded (video_path may be a server temp file)
 
     def to_json(self) -> Dict[str, Any]:
         return {
@@ -57,3 +182,15 @@ class AnalysisResult:
             },
             "suggestions": [s.to_dict() for s in self.suggestions]
         }
+
+@dataclass
+class AnalysisUpdate:
+    """
+    Incremental output of a progressive analysis.
+    `changed` holds new or revised suggestions (matched by suggestion_id), `removed`
+    the IDs of suggestions that no longer apply. The last update carries the result.
+    """
+    stage: str
+    changed: List[EditingSuggestion]
+    removed: List[str]
+    result: Optional[AnalysisResult] = None
@@ -0,0 +1,54 @@
+from dataclasses import dataclass
+from typing import Dict
+from VideoEditorAI.core.config import settings
+
+@dataclass(frozen=True)
+class PipelineProfile:
+    """A named accuracy/latency trade-off that /analyze can select per request."""
+    name: str
+    whisper_model: str
+    embedding_model: str
+    semantic: bool = True  # embeddings + redundancy detection
+    scene_detection: bool = True
+    beam_size: int = 1  # Whisper decoding, 1 = greedy
+    word_timestamps: bool = False
+    cost_factor: float = 1.0  # relative CPU cost, scales the admission estimate
+
+def _builtin_profiles() -> Dict[str, PipelineProfile]:
+    return {
+        # Quick preview: smallest Whisper, no embeddings
+        "fast": PipelineProfile(
+            name="fast",
+            whisper_model="tiny",
+            embedding_model=settings.EMBEDDING_MODEL,
+            semantic=False,
+            scene_detection=settings.SCENE_DETECTION,
+            cost_factor=0.3
+        ),
+        # The Config defaults
+        "balanced": PipelineProfile(
+            name="balanced",
+            whisper_model=settings.WHISPER_MODEL_SIZE,
+            embedding_model=settings.EMBEDDING_MODEL,
+            scene_detection=settings.SCENE_DETECTION,
+            word_timestamps=settings.WORD_TIMESTAMPS
+        ),
+        "accurate": PipelineProfile(
+            name="accurate",
+            whisper_model="small",
+            embedding_model=settings.EMBEDDING_MODEL,
+            scene_detection=settings.SCENE_DETECTION,
+            beam_size=5,
+            word_timestamps=True,
+            cost_factor=3.0
+        ),
+    }
+
+PROFILES: Dict[str, PipelineProfile] = _builtin_profiles()
+
+def get_profile(name: str = "") -> PipelineProfile:
+    """The named profile (settings.DEFAULT_PROFILE when empty). Raises ValueError if unknown."""
+    name = name or settings.DEFAULT_PROFILE
+    if name not in PROFILES:
+        raise ValueError(f"Unknown profile '{name}', expected one of: {', '.join(PROFILES)}")
+    return PROFILES[name]
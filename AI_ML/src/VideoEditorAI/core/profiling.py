@@ -0,0 +1,207 @@
+import cProfile
+import io
+import json
+import os
+import pstats
+import sys
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from typing import Dict, Any, List, Optional
+from VideoEditorAI.core.config import settings
+
+try:
+    import resource  # Unix only
+except ImportError:
+    resource = None
+
+PROFILE_JSON = "profile.json"
+PROFILE_STATS = "profile.pstats"
+PROFILE_TEXT = "profile.txt"
+
+def _rss_bytes() -> int:
+    """Current resident set size of this process (0 if unknown)."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        return 0
+
+def _max_rss_bytes() -> int:
+    """Peak RSS of this process so far."""
+    if resource is None:
+        return 0
+    # ru_maxrss is in KB on Linux, bytes on macOS
+    scale = 1 if sys.platform == "darwin" else 1024
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * scale
+
+def _children_cpu() -> float:
+    """CPU seconds used by finished child processes (ffmpeg), 0 where unsupported."""
+    if resource is None:
+        return 0.0
+    usage = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return usage.ru_utime + usage.ru_stime
+
+class NullProfiler:
+    """Used when profiling is off: stage() is a shared no-op context, nothing is recorded."""
+
+    enabled = False
+    _noop = nullcontext()
+
+    def stage(self, name: str):
+        return self._noop
+
+    def save(self, store, analysis_id: str):
+        return None
+
+    def close(self):
+        pass
+
+NULL_PROFILER = NullProfiler()
+
+class RunProfiler:
+    """
+    Profiles one analysis run: cProfile plus wall/CPU time and peak RSS per stage.
+
+    Only code inside stage() blocks is measured. The pipeline is a generator that
+    may be resumed on different threads (the SSE endpoint), so cProfile is enabled
+    and disabled around each stage on whatever thread runs it, and time spent
+    suspended at a yield is never counted.
+
+    CPU time is process-wide (it includes torch's worker threads and any other
+    request running at the same time); ffmpeg's CPU is reported separately as
+    child CPU once the process has exited. RSS is also process-wide.
+    """
+
+    enabled = True
+
+    def __init__(self, sample_interval: float = 0.05):
+        self.sample_interval = sample_interval
+        self.profile = cProfile.Profile()
+        self.stages: List[Dict[str, Any]] = []
+        self._started = time.perf_counter()
+        self._peak_rss = 0
+        self._sampling = threading.Event()
+        self._stop = threading.Event()
+        self._sampler = threading.Thread(target=self._sample_rss, name="profile-rss", daemon=True)
+        self._sampler.start()
+
+    def _sample_rss(self):
+        while not self._stop.wait(self.sample_interval):
+            if self._sampling.is_set():
+                self._peak_rss = max(self._peak_rss, _rss_bytes())
+
+    @contextmanager
+    def stage(self, name: str):
+        self._peak_rss = _rss_bytes()
+        self._sampling.set()
+        wall, cpu, child_cpu = time.perf_counter(), time.process_time(), _children_cpu()
+        try:
+            self.profile.enable()
+            profiling = True
+        except ValueError:
+            # Python 3.12+ allows one profiler per process; another profiled request
+            # holds it, so this stage gets timings only
+            profiling = False
+        try:
+            yield
+        finally:
+            if profiling:
+                self.profile.disable()
+            self._sampling.clear()
+            self._record(
+                name,
+                time.perf_counter() - wall,
+                time.process_time() - cpu,
+                _children_cpu() - child_cpu,
+                max(self._peak_rss, _rss_bytes())
+            )
+
+    def _record(self, name: str, wall: float, cpu: float, child_cpu: float, peak_rss: int):
+        # A stage that runs several times (the decision engine) is summed into one entry
+        for entry in self.stages:
+            if entry["stage"] == name:
+                entry["calls"] += 1
+                entry["wall_seconds"] += wall
+                entry["cpu_seconds"] += cpu
+                entry["child_cpu_seconds"] += child_cpu
+                entry["peak_rss_mb"] = max(entry["peak_rss_mb"], peak_rss / 1024 / 1024)
+                return
+        self.stages.append({
+            "stage": name,
+            "calls": 1,
+            "wall_seconds": wall,
+            "cpu_seconds": cpu,
+            "child_cpu_seconds": child_cpu,
+            "peak_rss_mb": peak_rss / 1024 / 1024
+        })
+
+    def report(self, top_n: Optional[int] = None) -> Dict[str, Any]:
+        top_n = top_n or settings.PROFILE_TOP_FUNCTIONS
+        stats = self._stats()
+        functions = []
+        for (filename, line, func), (cc, nc, tt, ct, _) in (stats.stats.items() if stats else []):
+            functions.append({
+                "function": f"{os.path.basename(filename)}:{line}({func})",
+                "calls": nc,
+                "self_seconds": round(tt, 6),
+                "cumulative_seconds": round(ct, 6)
+            })
+        functions.sort(key=lambda f: f["cumulative_seconds"], reverse=True)
+
+        measured = sum(s["wall_seconds"] for s in self.stages)
+        return {
+            "total_wall_seconds": round(time.perf_counter() - self._started, 4),
+            "measured_wall_seconds": round(measured, 4),
+            "max_rss_mb": round(_max_rss_bytes() / 1024 / 1024, 1),
+            "stages": [
+                {k: round(v, 4) if isinstance(v, float) else v for k, v in s.items()}
+                for s in self.stages
+            ],
+            "top_functions": functions[:top_n]
+        }
+
+    def _stats(self, stream=None) -> Optional[pstats.Stats]:
+        try:
+            return pstats.Stats(self.profile, stream=stream)
+        except TypeError:
+            # Nothing was recorded (no stage could enable cProfile)
+            return None
+
+    def save(self, store, analysis_id: str) -> Dict[str, Any]:
+        """
+        Writes profile.json (stages + hottest functions), profile.pstats (for
+        snakeviz / pstats) and profile.txt next to the analysis. Returns the report.
+        """
+        self._stop.set()
+        report = self.report()
+        report["analysis_id"] = analysis_id
+
+        with open(store.path_for(analysis_id, PROFILE_JSON), "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        self.profile.dump_stats(store.path_for(analysis_id, PROFILE_STATS))
+
+        text = io.StringIO()
+        for s in report["stages"]:
+            text.write(
+                f"{s['stage']:<16} wall {s['wall_seconds']:>9.3f}s  cpu {s['cpu_seconds']:>9.3f}s  "
+                f"ffmpeg {s['child_cpu_seconds']:>8.3f}s  peak rss {s['peak_rss_mb']:>8.1f} MB  x{s['calls']}\n"
+            )
+        text.write("\n")
+        stats = self._stats(stream=text)
+        if stats:
+            stats.sort_stats("cumulative").print_stats(settings.PROFILE_TOP_FUNCTIONS)
+        with open(store.path_for(analysis_id, PROFILE_TEXT), "w", encoding="utf-8") as f:
+            f.write(text.getvalue())
+
+        print(f"INFO:ai.profiler:Profile saved for analysis {analysis_id} ({report['measured_wall_seconds']}s measured).")
+        return report
+
+    def close(self):
+        self._stop.set()
+
+def make_profiler(enabled: Optional[bool] = None):
+    """A RunProfiler when enabled (default: settings.PROFILE_REQUESTS), else the shared no-op."""
+    if enabled is None:
+        enabled = settings.PROFILE_REQUESTS
+    return RunProfiler() if enabled else NULL_PROFILER
@@ -0,0 +1,107 @@
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Tuple
+from VideoEditorAI.core.config import settings
+
+def model_bytes(model: Any) -> int:
+    """Size of a torch model's parameters and buffers (0 for models that don't expose them)."""
+    total = 0
+    for attr in ("parameters", "buffers"):
+        tensors = getattr(model, attr, None)
+        if not callable(tensors):
+            continue
+        try:
+            total += sum(t.numel() * t.element_size() for t in tensors())
+        except Exception:
+            pass
+    return total
+
+class ModelRegistry:
+    """
+    Loads models on demand and shares them between requests.
+
+    Models are keyed by (kind, name). When the loaded models exceed the memory
+    budget, the least recently used ones are dropped from the registry (a request
+    still using one keeps it alive until it finishes). Pinned models, such as the
+    default profile's models preloaded at startup, are never evicted.
+    """
+
+    def __init__(self, budget_bytes: Optional[int] = None):
+        if budget_bytes is None:
+            budget_bytes = settings.MODEL_MEMORY_BUDGET_MB * 1024 * 1024
+        self.budget_bytes = budget_bytes
+        self._models: "OrderedDict[Tuple[str, str], Any]" = OrderedDict()
+        self._sizes: Dict[Tuple[str, str], int] = {}
+        self._pinned = set()
+        self._lock = threading.Lock()
+        self._loading: Dict[Tuple[str, str], threading.Lock] = {}
+        self._loads = 0
+        self._evictions = 0
+
+    def get(self, kind: str, name: str, loader: Callable[[], Any]) -> Any:
+        """Returns the (kind, name) model, calling loader() the first time it is needed."""
+        key = (kind, name)
+        with self._lock:
+            if key in self._models:
+                self._models.move_to_end(key)
+                return self._models[key]
+            load_lock = self._loading.setdefault(key, threading.Lock())
+
+        # One load per key at a time; other keys keep loading in parallel
+        with load_lock:
+            with self._lock:
+                if key in self._models:
+                    self._models.move_to_end(key)
+                    return self._models[key]
+
+            model = loader()
+            size = model_bytes(model)
+            with self._lock:
+                self._models[key] = model
+                self._sizes[key] = size
+                self._loads += 1
+                self._loading.pop(key, None)
+                self._evict(keep=key)
+            print(f"INFO:ai.models:Loaded {kind} model '{name}' ({size / 1024 / 1024:.0f} MB).")
+            return model
+
+    def pin_all(self):
+        """Pins every model loaded so far (the preloaded defaults)."""
+        with self._lock:
+            self._pinned.update(self._models)
+
+    def loaded(self) -> Dict[Tuple[str, str], Any]:
+        with self._lock:
+            return dict(self._models)
+
+    def used_bytes(self) -> int:
+        with self._lock:
+            return sum(self._sizes.values())
+
+    def _evict(self, keep: Tuple[str, str]):
+        # Called with self._lock held
+        if self.budget_bytes <= 0:
+            return
+        used = sum(self._sizes.values())
+        for key in list(self._models):
+            if used <= self.budget_bytes:
+                break
+            if key == keep or key in self._pinned:
+                continue
+            used -= self._sizes.pop(key)
+            del self._models[key]
+            self._evictions += 1
+            print(f"INFO:ai.models:Evicted {key[0]} model '{key[1]}' (memory budget {self.budget_bytes // 1024 // 1024} MB).")
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "budget_bytes": self.budget_bytes,
+                "used_bytes": sum(self._sizes.values()),
+                "loads_total": self._loads,
+                "evictions_total": self._evictions,
+                "models": [
+                    {"kind": kind, "name": name, "bytes": self._sizes[(kind, name)], "pinned": (kind, name) in self._pinned}
+                    for kind, name in self._models
+                ]
+            }
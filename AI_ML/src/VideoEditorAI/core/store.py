@@ -0,0 +1,80 @@
+import json
+import os
+import time
+import uuid
+from typing import Dict, Any, List, Optional
+from VideoEditorAI.core.config import settings
+from VideoEditorAI.core.models import AnalysisResult, EditingSuggestion
+
+class AnalysisStore:
+    """
+    Keeps finished analyses on disk, one directory per analysis ID under OUTPUT_DIR.
+    `analysis.json` holds the record; other artifacts (exports, reports...) are saved
+    next to it via path_for().
+    """
+
+    RECORD_NAME = "analysis.json"
+
+    def __init__(self, root: Optional[str] = None):
+        self.root = root or settings.OUTPUT_DIR
+        os.makedirs(self.root, exist_ok=True)
+
+    @staticmethod
+    def new_id() -> str:
+        return str(uuid.uuid4())[:8]
+
+    def analysis_dir(self, analysis_id: str) -> str:
+        # IDs come from URLs: only allow our own hex format so they can't escape the root
+        if not analysis_id or not all(c in "0123456789abcdef-" for c in analysis_id):
+            raise ValueError(f"Invalid analysis id: {analysis_id!r}")
+        return os.path.join(self.root, analysis_id)
+
+    def path_for(self, analysis_id: str, name: str) -> str:
+        """Path of an artifact stored alongside the analysis (the directory is created)."""
+        directory = self.analysis_dir(analysis_id)
+        os.makedirs(directory, exist_ok=True)
+        return os.path.join(directory, name)
+
+    def save(self, result: AnalysisResult) -> str:
+        """Writes the analysis record and returns its path."""
+        if not result.analysis_id:
+            result.analysis_id = self.new_id()
+        record = {
+            "analysis_id": result.analysis_id,
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "video_path": result.video_path,
+            "source_name": result.source_name,
+            "duration": result.duration,
+            "language": result.language,
+            "profile": result.profile,
+            "media_info": result.media_info,
+            "silence_segments": [[float(s), float(e)] for s, e in result.silence_segments],
+            "suggestions": [s.to_record() for s in result.suggestions]
+        }
+        path = self.path_for(result.analysis_id, self.RECORD_NAME)
+        # Write-then-rename so readers never see a half-written record
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(record, f)
+        os.replace(tmp_path, path)
+        return path
+
+    def write_artifact(self, analysis_id: str, name: str, data: bytes) -> str:
+        """Atomically writes a binary artifact next to the analysis and returns its path."""
+        path = self.path_for(analysis_id, name)
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+        return path
+
+    def load(self, analysis_id: str) -> Dict[str, Any]:
+        """Returns the saved record. Raises FileNotFoundError for unknown IDs."""
+        path = os.path.join(self.analysis_dir(analysis_id), self.RECORD_NAME)
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"Analysis not found: {analysis_id}")
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def load_suggestions(self, analysis_id: str) -> List[EditingSuggestion]:
+        return [EditingSuggestion.from_record(r) for r in self.load(analysis_id)["suggestions"]]
@@ -0,0 +1,201 @@
+import hashlib
+import json
+import os
+import shutil
+import time
+import uuid
+from typing import Dict, Any, Iterable, List, Optional
+from VideoEditorAI.core.config import settings
+
+class ChunkWriter:
+    """
+    Streams one chunk straight into its slot of the upload's data file.
+    Nothing is buffered beyond the pieces handed to write(); the chunk is only
+    recorded as received once commit() has checked its length and checksum.
+    """
+
+    def __init__(self, upload: "UploadManager", upload_id: str, index: int, offset: int, length: int):
+        self.upload = upload
+        self.upload_id = upload_id
+        self.index = index
+        self.length = length
+        self.written = 0
+        self._hash = hashlib.sha256()
+        self._file = open(upload.data_path(upload_id), "r+b")
+        self._file.seek(offset)
+
+    def write(self, data: bytes):
+        if self.written + len(data) > self.length:
+            raise ValueError(f"Chunk {self.index} is larger than {self.length} bytes")
+        self._file.write(data)
+        self._hash.update(data)
+        self.written += len(data)
+
+    def commit(self, expected_sha256: Optional[str] = None) -> str:
+        self._file.close()
+        if self.written != self.length:
+            raise ValueError(f"Chunk {self.index} has {self.written} bytes, expected {self.length}")
+        digest = self._hash.hexdigest()
+        if expected_sha256 and expected_sha256.lower() != digest:
+            raise ValueError(f"Checksum mismatch for chunk {self.index}")
+        self.upload._mark_received(self.upload_id, self.index, digest)
+        return digest
+
+    def abort(self):
+        self._file.close()
+
+class UploadManager:
+    """
+    Resumable chunked uploads kept on disk under TEMP_DIR/uploads/<upload_id>/.
+
+    The data file is preallocated at creation; every chunk is written in place at
+    index * chunk_size, so chunks can arrive in any order and in parallel. Each
+    received chunk leaves a small marker file holding its SHA-256, which makes the
+    state safe to share between worker processes and survive restarts.
+    """
+
+    MANIFEST = "manifest.json"
+
+    def __init__(self, root: Optional[str] = None):
+        self.root = root or os.path.join(settings.TEMP_DIR, "uploads")
+        os.makedirs(self.root, exist_ok=True)
+
+    def _dir(self, upload_id: str) -> str:
+        if not upload_id or not all(c in "0123456789abcdef" for c in upload_id):
+            raise FileNotFoundError(f"Upload not found: {upload_id}")
+        return os.path.join(self.root, upload_id)
+
+    def data_path(self, upload_id: str) -> str:
+        return os.path.join(self._dir(upload_id), "data" + self.manifest(upload_id)["extension"])
+
+    def create(self, filename: str, total_size: int, chunk_size: Optional[int] = None) -> Dict[str, Any]:
+        max_chunk = settings.UPLOAD_MAX_CHUNK_MB * 1024 * 1024
+        max_size = settings.UPLOAD_MAX_SIZE_MB * 1024 * 1024
+        chunk_size = chunk_size or settings.UPLOAD_CHUNK_SIZE_MB * 1024 * 1024
+        if not 0 < total_size <= max_size:
+            raise ValueError(f"total_size must be between 1 and {max_size} bytes")
+        # Tiny chunks would make the chunk count (and every status listing) huge;
+        # a file smaller than the minimum is simply sent as one chunk
+        min_chunk = min(settings.UPLOAD_MIN_CHUNK_KB * 1024, total_size)
+        if not min_chunk <= chunk_size <= max_chunk:
+            raise ValueError(f"chunk_size must be between {min_chunk} and {max_chunk} bytes")
+
+        self.sweep_expired()
+
+        upload_id = uuid.uuid4().hex
+        directory = os.path.join(self.root, upload_id)
+        os.makedirs(os.path.join(directory, "chunks"))
+        manifest = {
+            "upload_id": upload_id,
+            "filename": os.path.basename(filename),
+            "extension": os.path.splitext(filename)[1].lower()[:10],
+            "total_size": total_size,
+            "chunk_size": chunk_size,
+            "chunk_count": (total_size + chunk_size - 1) // chunk_size,
+            "created": time.time()
+        }
+        with open(os.path.join(directory, self.MANIFEST), "w", encoding="utf-8") as f:
+            json.dump(manifest, f)
+        # Sparse preallocation: chunks are written into place, no reassembly step
+        with open(os.path.join(directory, "data" + manifest["extension"]), "wb") as f:
+            f.truncate(total_size)
+        return manifest
+
+    def manifest(self, upload_id: str) -> Dict[str, Any]:
+        path = os.path.join(self._dir(upload_id), self.MANIFEST)
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"Upload not found: {upload_id}")
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def open_chunk(self, upload_id: str, index: int) -> ChunkWriter:
+        manifest = self.manifest(upload_id)
+        if not 0 <= index < manifest["chunk_count"]:
+            raise ValueError(f"Chunk index {index} out of range (0-{manifest['chunk_count'] - 1})")
+        offset = index * manifest["chunk_size"]
+        length = min(manifest["chunk_size"], manifest["total_size"] - offset)
+        # A re-sent chunk overwrites the old bytes, so it counts as missing until committed
+        marker = os.path.join(self._dir(upload_id), "chunks", str(index))
+        if os.path.exists(marker):
+            os.remove(marker)
+        return ChunkWriter(self, upload_id, index, offset, length)
+
+    def _mark_received(self, upload_id: str, index: int, digest: str):
+        marker = os.path.join(self._dir(upload_id), "chunks", str(index))
+        with open(marker + ".tmp", "w") as f:
+            f.write(digest)
+        os.replace(marker + ".tmp", marker)
+
+    def received(self, upload_id: str) -> Dict[int, str]:
+        """index -> sha256 of every chunk received so far."""
+        chunks_dir = os.path.join(self._dir(upload_id), "chunks")
+        received = {}
+        for name in os.listdir(chunks_dir):
+            if name.isdigit():
+                with open(os.path.join(chunks_dir, name)) as f:
+                    received[int(name)] = f.read().strip()
+        return received
+
+    def status(self, upload_id: str) -> Dict[str, Any]:
+        """
+        Upload progress. received and missing are lists of inclusive [first, last]
+        chunk index ranges, so the response stays small however many chunks there are.
+        """
+        manifest = self.manifest(upload_id)
+        received = sorted(self.received(upload_id))
+        missing = _gaps(received, manifest["chunk_count"])
+        return {
+            "upload_id": upload_id,
+            "filename": manifest["filename"],
+            "total_size": manifest["total_size"],
+            "chunk_size": manifest["chunk_size"],
+            "chunk_count": manifest["chunk_count"],
+            "received": _ranges(received),
+            "received_count": len(received),
+            "missing": missing,
+            "complete": not missing
+        }
+
+    def finalize(self, upload_id: str) -> str:
+        """Returns the path of the complete file. Raises ValueError if chunks are missing."""
+        status = self.status(upload_id)
+        if status["missing"]:
+            raise ValueError(f"Upload incomplete, missing chunk ranges: {status['missing'][:20]}")
+        return self.data_path(upload_id)
+
+    def delete(self, upload_id: str):
+        shutil.rmtree(self._dir(upload_id), ignore_errors=True)
+
+    def sweep_expired(self):
+        """Removes uploads untouched for longer than UPLOAD_TTL_HOURS."""
+        cutoff = time.time() - settings.UPLOAD_TTL_HOURS * 3600
+        for name in os.listdir(self.root):
+            path = os.path.join(self.root, name)
+            try:
+                last_activity = max(os.path.getmtime(path), os.path.getmtime(os.path.join(path, "chunks")))
+            except OSError:
+                last_activity = 0
+            if last_activity < cutoff:
+                shutil.rmtree(path, ignore_errors=True)
+
+def _ranges(indices: Iterable[int]) -> List[List[int]]:
+    """Sorted indices as inclusive [first, last] runs: 0,1,2,5 -> [[0, 2], [5, 5]]."""
+    runs: List[List[int]] = []
+    for i in indices:
+        if runs and runs[-1][1] == i - 1:
+            runs[-1][1] = i
+        else:
+            runs.append([i, i])
+    return runs
+
+def _gaps(received: List[int], count: int) -> List[List[int]]:
+    """Inclusive [first, last] runs of the indices in range(count) missing from sorted received."""
+    gaps = []
+    expected = 0
+    for i in received:
+        if i > expected:
+            gaps.append([expected, i - 1])
+        expected = i + 1
+    if expected < count:
+        gaps.append([expected, count - 1])
+    return gaps
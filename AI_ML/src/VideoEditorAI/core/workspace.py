@@ -0,0 +1,217 @@
+import os
+import shutil
+import threading
+import uuid
+from contextlib import contextmanager
+from typing import Dict, Any, Iterator, List, Optional
+from VideoEditorAI.core.config import settings
+
+TMPFS_ROOT = "/dev/shm"
+
+class QuotaExceededError(RuntimeError):
+    """Raised when a job needs more scratch space than the quota allows, even after eviction."""
+
+class JobWorkspace:
+    """An isolated scratch directory owned by a single analysis job."""
+
+    def __init__(self, manager: "WorkspaceManager", job_id: str, path: str):
+        self.manager = manager
+        self.job_id = job_id
+        self.path = path
+        self.dir_name = os.path.basename(path)
+
+    def path_for(self, name: str) -> str:
+        """Absolute path for an artifact inside this job's directory."""
+        return os.path.join(self.path, name)
+
+    def reserve(self, nbytes: int):
+        """
+        Makes room for nbytes of new artifacts, evicting old ones if needed. The bytes
+        stay reserved for this job until it ends, so concurrent jobs can't all pass
+        the quota check before any of them has written its files.
+        """
+        self.manager.ensure_capacity(nbytes, job=self)
+
+    def usage_bytes(self) -> int:
+        return _dir_size(self.path)
+
+class WorkspaceManager:
+    """
+    Hands out per-job scratch directories and keeps their total size under a quota.
+
+    Every job gets its own directory (so concurrent uploads with the same file name
+    can't clobber each other) which is removed as soon as the job ends. Directories
+    left behind by crashed processes are evicted least-recently-used first when the
+    quota is hit.
+    """
+
+    def __init__(self, root: Optional[str] = None, quota_bytes: Optional[int] = None, use_tmpfs: Optional[bool] = None):
+        if use_tmpfs is None:
+            use_tmpfs = settings.SCRATCH_USE_TMPFS
+        if root is None:
+            if use_tmpfs and os.path.isdir(TMPFS_ROOT) and os.access(TMPFS_ROOT, os.W_OK):
+                root = os.path.join(TMPFS_ROOT, "videoeditorai")
+            else:
+                root = settings.SCRATCH_DIR or os.path.join(settings.TEMP_DIR, "jobs")
+        if quota_bytes is None:
+            quota_bytes = settings.SCRATCH_QUOTA_MB * 1024 * 1024
+
+        self.root = root
+        self.quota_bytes = quota_bytes
+        self.on_tmpfs = root.startswith(TMPFS_ROOT + os.sep)
+        self._active = set()
+        self._reserved: Dict[str, int] = {}  # job dir name -> bytes reserved so far
+        self._lock = threading.Lock()
+        self._evicted_bytes = 0
+        self._evicted_files = 0
+        os.makedirs(self.root, exist_ok=True)
+
+    @contextmanager
+    def job(self, job_id: Optional[str] = None) -> Iterator[JobWorkspace]:
+        """Creates a scratch directory for one job and deletes it when the block exits."""
+        # The pid prefix lets other worker processes tell live jobs from stale ones
+        job_id = job_id or uuid.uuid4().hex
+        dir_name = f"{os.getpid()}-{job_id}"
+        path = os.path.join(self.root, dir_name)
+        os.makedirs(path, exist_ok=False)
+        with self._lock:
+            self._active.add(dir_name)
+        try:
+            yield JobWorkspace(self, job_id, path)
+        finally:
+            with self._lock:
+                self._active.discard(dir_name)
+                self._reserved.pop(dir_name, None)
+            shutil.rmtree(path, ignore_errors=True)
+
+    def ensure_capacity(self, nbytes: int, job: Optional[JobWorkspace] = None):
+        """
+        Evicts artifacts of finished/stale jobs (least recently used first) until
+        nbytes more fit under the quota. Raises QuotaExceededError if they can't.
+        With a job, the bytes are recorded as reserved for it until the job ends.
+        """
+        if self.quota_bytes <= 0:
+            return
+
+        with self._lock:
+            used = _dir_size(self.root) + self._outstanding_reservations()
+            if used + nbytes <= self.quota_bytes:
+                self._reserve(job, nbytes)
+                return
+
+            for path, size in self._eviction_candidates():
+                try:
+                    os.remove(path)
+                except OSError:
+                    continue
+                used -= size
+                self._evicted_bytes += size
+                self._evicted_files += 1
+                if used + nbytes <= self.quota_bytes:
+                    break
+
+            self._remove_empty_stale_dirs()
+
+            if used + nbytes > self.quota_bytes:
+                raise QuotaExceededError(
+                    f"Scratch quota exceeded: need {nbytes} bytes, {used} of {self.quota_bytes} bytes in use or reserved by active jobs"
+                )
+            self._reserve(job, nbytes)
+
+    def _reserve(self, job: Optional[JobWorkspace], nbytes: int):
+        # Called with self._lock held
+        if job is not None and job.dir_name in self._active:
+            self._reserved[job.dir_name] = self._reserved.get(job.dir_name, 0) + nbytes
+
+    def _outstanding_reservations(self) -> int:
+        """Reserved bytes that active jobs haven't written yet (what's on disk is counted already)."""
+        # Called with self._lock held
+        outstanding = 0
+        for dir_name, reserved in self._reserved.items():
+            outstanding += max(0, reserved - _dir_size(os.path.join(self.root, dir_name)))
+        return outstanding
+
+    def _eviction_candidates(self) -> List[tuple]:
+        """Files that don't belong to a live job, oldest access first."""
+        candidates = []
+        for entry in _scandir(self.root):
+            if entry.is_dir(follow_symlinks=False) and self._is_live(entry.name):
+                continue
+            if entry.is_file(follow_symlinks=False):
+                files = [entry]
+            else:
+                files = list(_walk_files(entry.path))
+            for f in files:
+                try:
+                    st = f.stat(follow_symlinks=False)
+                except OSError:
+                    continue
+                candidates.append((max(st.st_atime, st.st_mtime), f.path, st.st_size))
+        candidates.sort()
+        return [(path, size) for _, path, size in candidates]
+
+    def _remove_empty_stale_dirs(self):
+        for entry in _scandir(self.root):
+            if entry.is_dir(follow_symlinks=False) and not self._is_live(entry.name):
+                for dirpath, _, _ in sorted(os.walk(entry.path), key=lambda w: -len(w[0])):
+                    try:
+                        os.rmdir(dirpath)
+                    except OSError:
+                        pass
+
+    def _is_live(self, dir_name: str) -> bool:
+        if dir_name in self._active:
+            return True
+        pid_part = dir_name.split("-", 1)[0]
+        if not pid_part.isdigit():
+            return False
+        pid = int(pid_part)
+        if pid == os.getpid() or os.name == "nt":
+            # Our own jobs are tracked in _active; on Windows os.kill can't probe safely
+            return False
+        try:
+            os.kill(pid, 0)
+        except ProcessLookupError:
+            return False
+        except OSError:
+            return True
+        return True
+
+    def usage(self) -> Dict[str, Any]:
+        """Disk usage snapshot for metrics."""
+        with self._lock:
+            active_jobs = len(self._active)
+            reserved = self._outstanding_reservations()
+        return {
+            "root": self.root,
+            "tmpfs": self.on_tmpfs,
+            "bytes_used": _dir_size(self.root),
+            "reserved_bytes": reserved,
+            "quota_bytes": self.quota_bytes,
+            "active_jobs": active_jobs,
+            "evicted_bytes_total": self._evicted_bytes,
+            "evicted_files_total": self._evicted_files,
+        }
+
+def _scandir(path: str):
+    try:
+        with os.scandir(path) as it:
+            return list(it)
+    except OSError:
+        return []
+
+def _walk_files(path: str):
+    for entry in _scandir(path):
+        if entry.is_dir(follow_symlinks=False):
+            yield from _walk_files(entry.path)
+        elif entry.is_file(follow_symlinks=False):
+            yield entry
+
+def _dir_size(path: str) -> int:
+    total = 0
+    for f in _walk_files(path):
+        try:
+            total += f.stat(follow_symlinks=False).st_size
+        except OSError:
+            pass
+    return total
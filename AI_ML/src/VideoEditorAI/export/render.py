@@ -0,0 +1,195 @@
+import json
+import os
+import subprocess
+from typing import List, Tuple, Optional, Dict, Any, Union
+from VideoEditorAI.core.workspace import WorkspaceManager
+from VideoEditorAI.analysis.keyframes import KeyframeIndex
+
+# Encoders for the short re-encoded heads in exact mode, matched to the source
+# codec so they can be concatenated with the stream-copied packets
+REENCODERS = {
+    "h264": ["-c:v", "libx264", "-preset", "veryfast", "-crf", "18"],
+    "hevc": ["-c:v", "libx265", "-preset", "veryfast", "-crf", "20"],
+    "mpeg4": ["-c:v", "mpeg4", "-q:v", "2"],
+    "vp9": ["-c:v", "libvpx-vp9", "-crf", "30", "-b:v", "0"],
+}
+
+# ffprobe profile names -> encoder -profile:v values
+H264_PROFILES = {
+    "baseline": "baseline", "constrained baseline": "baseline", "main": "main",
+    "high": "high", "high 10": "high10", "high 4:2:2": "high422", "high 4:4:4 predictive": "high444",
+}
+HEVC_PROFILES = {"main": "main", "main 10": "main10", "main still picture": "mainstillpicture"}
+
+# Containers whose video time base can be set with -video_track_timescale
+TIMESCALE_CONTAINERS = (".mp4", ".m4v", ".mov")
+
+def probe_source(video_path: str) -> Dict[str, Any]:
+    """
+    Encoding parameters of the first video stream (codec, profile, level, pix_fmt,
+    time_base), which exact-mode heads must match.
+    """
+    command = [
+        "ffprobe",
+        "-v", "error",
+        "-select_streams", "v:0",
+        "-show_entries", "stream=codec_name,profile,level,pix_fmt,time_base",
+        "-of", "json",
+        video_path
+    ]
+    result = subprocess.run(command, capture_output=True, text=True, check=True)
+    streams = json.loads(result.stdout).get("streams", [])
+    if not streams:
+        return {}
+    stream = streams[0]
+    return {
+        "codec": stream.get("codec_name", ""),
+        "profile": stream.get("profile", ""),
+        "level": stream.get("level"),
+        "pix_fmt": stream.get("pix_fmt", ""),
+        "time_base": stream.get("time_base", "")
+    }
+
+def head_encoder_args(source: Dict[str, Any], ext: str) -> List[str]:
+    """
+    Encoder options for an exact-mode head that match the source stream, so the
+    re-encoded frames can share one stream with the copied packets. Raises
+    ValueError for codecs or settings that can't be matched.
+    """
+    codec = source.get("codec", "")
+    if codec not in REENCODERS:
+        raise ValueError(f"Exact cuts can't re-encode '{codec or 'unknown'}' video to match the source; render without exact mode")
+
+    args = list(REENCODERS[codec])
+    profile = (source.get("profile") or "").lower()
+    level = source.get("level")
+    if codec in ("h264", "hevc"):
+        profiles = H264_PROFILES if codec == "h264" else HEVC_PROFILES
+        if profile and profile not in profiles:
+            raise ValueError(f"Exact cuts can't match the source's {codec} profile '{source['profile']}'; render without exact mode")
+        if profile:
+            args += ["-profile:v", profiles[profile]]
+        if isinstance(level, int) and level > 0:
+            # ffprobe reports 41 for h264 level 4.1 and 123 (30 x 4.1) for hevc
+            args += ["-level:v", f"{level / 10:.1f}" if codec == "h264" else f"{level / 30:.1f}"]
+    if source.get("pix_fmt"):
+        args += ["-pix_fmt", source["pix_fmt"]]
+    num, _, den = (source.get("time_base") or "").partition("/")
+    if ext.lower() in TIMESCALE_CONTAINERS and num == "1" and den.isdigit():
+        args += ["-video_track_timescale", den]
+    return args
+
+class RoughCutRenderer:
+    """
+    Renders the kept intervals of a video into a new file without a full re-encode.
+
+    Default mode stream-copies every interval through ffmpeg's concat demuxer, with
+    each start moved back to the previous keyframe (so a little of a cut may remain,
+    and a cut shorter than the distance to that keyframe is dropped).
+    Exact mode re-encodes only the head of each interval, from the exact start up to
+    the next keyframe, and stream-copies the rest (so with B-frames, a reordered frame
+    just past an interval's end can still slip through). The heads are encoded with the
+    source's profile, level, pixel format and time base and keep its audio packets
+    as they are; only h264, hevc, mpeg4 and vp9 sources are supported, and sources
+    with unusual encoder settings (e.g. interlaced) may still not concatenate
+    cleanly, in which case render without exact mode.
+    """
+
+    def __init__(self, workspace: Optional[WorkspaceManager] = None):
+        self.workspace = workspace or WorkspaceManager()
+
+    def render(
+        self,
+        video_path: str,
+        intervals: List[Tuple[float, float]],
+        output_path: str,
+        exact: bool = False,
+        keyframes: Optional[Union[KeyframeIndex, List[float]]] = None,
+        media_info: Optional[Dict[str, Any]] = None
+    ) -> str:
+        """
+        keyframes: a KeyframeIndex (e.g. the one cached with the analysis) or plain
+        keyframe times; probed with ffprobe when not given.
+        """
+        if not intervals:
+            raise ValueError("Nothing to render: every part of the video is cut")
+        if keyframes is None:
+            keyframes = KeyframeIndex.build(video_path)
+        elif not isinstance(keyframes, KeyframeIndex):
+            keyframes = KeyframeIndex.from_times(keyframes)
+        ext = os.path.splitext(video_path)[1] or ".mp4"
+        head_args = None
+        if exact:
+            # Fails before any work for sources the heads can't be matched to
+            head_args = head_encoder_args({**(media_info or {}), **probe_source(video_path)}, ext)
+
+        with self.workspace.job() as job:
+            # (file, inpoint, outpoint) entries for the concat list
+            entries = []
+            for i, (start, end) in enumerate(intervals):
+                if not exact:
+                    previous_key = keyframes.previous(start)
+                    inpoint = start if previous_key is None else previous_key
+                    if entries and inpoint < entries[-1][2]:
+                        # The keyframe lies inside the previous part: starting there would
+                        # play the overlap twice, so extend that part over the short cut
+                        entries[-1] = (video_path, entries[-1][1], end)
+                    else:
+                        entries.append((video_path, inpoint, end))
+                    continue
+
+                next_key = keyframes.next(start)
+                if next_key is not None and next_key - start < 0.001:
+                    entries.append((video_path, next_key, end))
+                    continue
+
+                # Re-encode only the partial GOP before the next keyframe
+                head_end = end if next_key is None else min(next_key, end)
+                head_path = job.path_for(f"head_{i:05d}{ext}")
+                self._encode_range(video_path, start, head_end, head_path, head_args)
+                entries.append((head_path, None, None))
+                if next_key is not None and next_key < end:
+                    entries.append((video_path, next_key, end))
+
+            list_path = job.path_for("concat.ffconcat")
+            with open(list_path, "w", encoding="utf-8") as f:
+                f.write("ffconcat version 1.0\n")
+                for path, inpoint, outpoint in entries:
+                    escaped = os.path.abspath(path).replace("'", "'\\''")
+                    f.write(f"file '{escaped}'\n")
+                    if inpoint is not None:
+                        f.write(f"inpoint {inpoint:.6f}\n")
+                    if outpoint is not None:
+                        f.write(f"outpoint {outpoint:.6f}\n")
+
+            command = [
+                "ffmpeg",
+                "-f", "concat", "-safe", "0",
+                "-i", list_path,
+                "-map", "0",
+                "-c", "copy",
+                "-avoid_negative_ts", "make_zero",
+                "-y",
+                "-loglevel", "error",
+                output_path
+            ]
+            print(f"INFO:ai.export:Rendering {len(intervals)} kept parts to {output_path} ({'exact' if exact else 'keyframe'} cuts)...")
+            subprocess.run(command, check=True)
+
+        return output_path
+
+    def _encode_range(self, video_path: str, start: float, end: float, output_path: str, video_args: List[str]):
+        command = [
+            "ffmpeg",
+            "-ss", f"{start:.6f}",
+            "-i", video_path,
+            "-t", f"{end - start:.6f}",
+            "-map", "0:v:0", "-map", "0:a:0?",
+            *video_args,
+            # Audio packets are copied so the codec matches the rest of the stream
+            "-c:a", "copy",
+            "-y",
+            "-loglevel", "error",
+            output_path
+        ]
+        subprocess.run(command, check=True)
@@ -0,0 +1,143 @@
+import os
+from pathlib import Path
+from fractions import Fraction
+from urllib.parse import quote
+from typing import List, Tuple
+from xml.etree import ElementTree as ET
+from VideoEditorAI.core.models import EditingSuggestion, SegmentType
+
+def keep_intervals(suggestions: List[EditingSuggestion], duration: float) -> List[Tuple[float, float]]:
+    """
+    The parts of the video that remain after removing every CUT suggestion,
+    as sorted, non-overlapping (start, end) pairs.
+    """
+    cuts = sorted(
+        (max(0.0, s.start_time), s.end_time)
+        for s in suggestions
+        if s.suggestion_type == SegmentType.CUT and s.end_time > s.start_time
+    )
+    if duration <= 0:
+        # Unknown duration: assume the video ends with the last suggestion
+        duration = max((s.end_time for s in suggestions), default=0.0)
+
+    keeps = []
+    position = 0.0
+    for start, end in cuts:
+        if start > position:
+            keeps.append((position, min(start, duration)))
+        position = max(position, end)
+        if position >= duration:
+            break
+    if position < duration:
+        keeps.append((position, duration))
+
+    # Drop slivers shorter than a frame or so
+    return [(s, e) for s, e in keeps if e - s > 0.02]
+
+def _frame_rate(fps: float) -> Fraction:
+    """Exact frame rate: 25.0 -> 25, 29.97 -> 30000/1001, 23.976 -> 24000/1001."""
+    if fps <= 0:
+        return Fraction(30)
+    if abs(fps - round(fps)) < 0.001:
+        return Fraction(round(fps))
+    ntsc_base = round(fps * 1.001)
+    if abs(fps - ntsc_base / 1.001) < 0.01:
+        return Fraction(ntsc_base * 1000, 1001)
+    return Fraction(fps).limit_denominator(1001)
+
+def _timecode(frames: int, fps: int) -> str:
+    ff = frames % fps
+    total_seconds = frames // fps
+    return f"{total_seconds // 3600:02d}:{(total_seconds // 60) % 60:02d}:{total_seconds % 60:02d}:{ff:02d}"
+
+def to_edl(intervals: List[Tuple[float, float]], source_name: str, fps: float = 30.0, title: str = "Rough Cut") -> str:
+    """
+    CMX3600 EDL that plays the given source intervals back to back.
+    Frame numbers come from the exact frame rate (29.97 is 30000/1001); timecodes
+    are non-drop-frame, counted at the rounded rate, as NTSC material is labelled.
+    """
+    rate = _frame_rate(fps)
+    tc_fps = max(1, int(round(float(rate))))
+    clip_name = os.path.basename(source_name)
+    # Reel names are limited to 8 characters; AX is the usual name for file-based media
+    reel = "AX"
+
+    lines = [f"TITLE: {title}", "FCM: NON-DROP FRAME", ""]
+    # Whole frames throughout so record timecodes never drift
+    record = 0
+    for i, (start, end) in enumerate(intervals, 1):
+        src_in, src_out = int(round(start * rate)), int(round(end * rate))
+        length = src_out - src_in
+        lines.append(
+            f"{i:03d}  {reel:<8} AA/V  C        "
+            f"{_timecode(src_in, tc_fps)} {_timecode(src_out, tc_fps)} "
+            f"{_timecode(record, tc_fps)} {_timecode(record + length, tc_fps)}"
+        )
+        lines.append(f"* FROM CLIP NAME: {clip_name}")
+        lines.append("")
+        record += length
+    return "\n".join(lines)
+
+def to_fcpxml(
+    intervals: List[Tuple[float, float]],
+    source_path: str,
+    duration: float,
+    fps: float = 30.0,
+    width: int = 1920,
+    height: int = 1080,
+    title: str = "Rough Cut"
+) -> str:
+    """
+    FCPXML 1.9 project whose spine holds one asset-clip per kept interval.
+    source_path is linked as given: an absolute path becomes a file:// URL, a bare
+    file name stays relative (the editor relinks it to the user's copy).
+    """
+    frame_duration = 1 / _frame_rate(fps)
+
+    def to_frames(seconds: float) -> int:
+        return int(round(seconds / frame_duration))
+
+    def rational(frames: int) -> str:
+        # FCPXML times must be whole frames, written as a rational number of seconds
+        value = frames * frame_duration
+        return "0s" if value == 0 else f"{value.numerator}/{value.denominator}s"
+
+    clip_name = os.path.basename(source_path)
+    # Work in whole frames so clips butt up against each other exactly on the spine
+    clips = [(to_frames(s), to_frames(e)) for s, e in intervals]
+    clips = [(s, e) for s, e in clips if e > s]
+    total = sum(e - s for s, e in clips)
+
+    root = ET.Element("fcpxml", version="1.9")
+    resources = ET.SubElement(root, "resources")
+    ET.SubElement(
+        resources, "format", id="r1",
+        frameDuration=f"{frame_duration.numerator}/{frame_duration.denominator}s",
+        width=str(width), height=str(height)
+    )
+    asset = ET.SubElement(
+        resources, "asset", id="r2", name=clip_name, start="0s",
+        duration=rational(to_frames(duration)), hasVideo="1", hasAudio="1", format="r1"
+    )
+    if os.path.isabs(source_path):
+        src = Path(source_path).as_uri()
+    else:
+        src = quote(source_path.replace(os.sep, "/"))
+    ET.SubElement(asset, "media-rep", kind="original-media", src=src)
+
+    library = ET.SubElement(root, "library")
+    event = ET.SubElement(library, "event", name=title)
+    project = ET.SubElement(event, "project", name=title)
+    sequence = ET.SubElement(project, "sequence", format="r1", tcStart="0s", tcFormat="NDF", duration=rational(total))
+    spine = ET.SubElement(sequence, "spine")
+
+    offset = 0
+    for start, end in clips:
+        ET.SubElement(
+            spine, "asset-clip", ref="r2", name=clip_name, format="r1",
+            offset=rational(offset), start=rational(start), duration=rational(end - start)
+        )
+        offset += end - start
+
+    ET.indent(root)
+    return '<?xml version="1.0" encoding="UTF-8"?>\n<!DOCTYPE fcpxml>\n' + ET.tostring(root, encoding="unicode") + "\n"
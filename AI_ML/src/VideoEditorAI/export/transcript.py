@@ -0,0 +1,75 @@
+from typing import List, Dict, Any
+import msgpack
+import numpy as np
+
+TRANSCRIPT_FILE = "transcript.msgpack"
+FORMAT_VERSION = 1
+
+def _text_column(texts: List[str]):
+    """UTF-8 blob of all texts plus n+1 byte offsets (text i is blob[offsets[i]:offsets[i+1]])."""
+    encoded = [t.encode("utf-8") for t in texts]
+    offsets = np.zeros(len(encoded) + 1, dtype="<u4")
+    np.cumsum([len(e) for e in encoded], out=offsets[1:])
+    return b"".join(encoded), offsets
+
+def encode_transcript(segments: List[Dict[str, Any]], language: str = "") -> bytes:
+    """
+    Columnar msgpack encoding of a Whisper transcript.
+
+    Every column is a raw little-endian array (msgpack bin), so a client reads it
+    with one typed-array view instead of parsing nested objects:
+      segments.start/end  float32[n]      segments.words  uint32[n+1] (word index range)
+      segments.text       uint32[n+1] byte offsets into segment_text (UTF-8)
+      words.start/end/probability float32[m]
+      words.text          uint32[m+1] byte offsets into word_text (UTF-8)
+    The words columns are empty unless the transcript has word timestamps.
+    """
+    words = [w for s in segments for w in s.get("words") or []]
+    word_counts = [len(s.get("words") or []) for s in segments]
+    word_index = np.zeros(len(segments) + 1, dtype="<u4")
+    np.cumsum(word_counts, out=word_index[1:])
+
+    segment_text, segment_offsets = _text_column([s.get("text", "") for s in segments])
+    word_text, word_offsets = _text_column([w.get("word", "") for w in words])
+
+    def column(values, dtype="<f4") -> bytes:
+        return np.asarray(values, dtype=dtype).tobytes()
+
+    record = {
+        "version": FORMAT_VERSION,
+        "language": language,
+        "segment_count": len(segments),
+        "word_count": len(words),
+        "segments": {
+            "start": column([s.get("start", 0.0) for s in segments]),
+            "end": column([s.get("end", 0.0) for s in segments]),
+            "words": word_index.tobytes(),
+            "text": segment_offsets.tobytes(),
+        },
+        "words": {
+            "start": column([w.get("start", 0.0) for w in words]),
+            "end": column([w.get("end", 0.0) for w in words]),
+            "probability": column([w.get("probability", 0.0) for w in words]),
+            "text": word_offsets.tobytes(),
+        },
+        "segment_text": segment_text,
+        "word_text": word_text,
+    }
+    return msgpack.packb(record, use_bin_type=True)
+
+def decode_transcript(data: bytes) -> Dict[str, Any]:
+    """Inverse of encode_transcript, with the columns as numpy arrays (zero-copy views)."""
+    record = msgpack.unpackb(data, raw=False)
+    if record.get("version") != FORMAT_VERSION:
+        raise ValueError(f"Unsupported transcript format version: {record.get('version')}")
+
+    def arrays(columns: Dict[str, bytes], offsets_key: str, index_key: str = "") -> Dict[str, np.ndarray]:
+        out = {k: np.frombuffer(v, dtype="<f4") for k, v in columns.items() if k not in (offsets_key, index_key)}
+        out[offsets_key] = np.frombuffer(columns[offsets_key], dtype="<u4")
+        if index_key:
+            out[index_key] = np.frombuffer(columns[index_key], dtype="<u4")
+        return out
+
+    record["segments"] = arrays(record["segments"], "text", "words")
+    record["words"] = arrays(record["words"], "text")
+    return record
@@ -1,22 +1,41 @@
 import os
 import json
 import subprocess
+from contextlib import ExitStack
+from typing import Optional, Iterator, Dict, Any
 from VideoEditorAI.core.config import settings
-from VideoEditorAI.core.models import AnalysisResult
+from VideoEditorAI.core.models import AnalysisResult, AnalysisUpdate, SegmentTable
+from VideoEditorAI.core.workspace import WorkspaceManager
+from VideoEditorAI.core.store import AnalysisStore
+from VideoEditorAI.core.profiling import make_profiler, NULL_PROFILER
+from VideoEditorAI.core.profiles import PipelineProfile, get_profile
+from VideoEditorAI.core.registry import ModelRegistry
 from VideoEditorAI.analysis.audio import AudioProcessor
 from VideoEditorAI.analysis.transcription import Transcriber
 from VideoEditorAI.analysis.semantic import SemanticAnalyzer
+from VideoEditorAI.analysis.visual import SceneDetector
+from VideoEditorAI.analysis.waveform import build_waveform, WAVEFORM_FILE
+from VideoEditorAI.analysis.keyframes import KeyframeIndex, BoundarySnapper, KEYFRAMES_FILE
+from VideoEditorAI.analysis.pcm import open_pcm
+from VideoEditorAI.export.transcript import encode_transcript, TRANSCRIPT_FILE
 from VideoEditorAI.rules.engine import DecisionEngine
 
 class VideoAnalysisPipeline:
     def __init__(self):
         print("INFO:ai.analyzer:Initializing AI Pipeline components...")
+        self.models = ModelRegistry()
+        self.default_profile = get_profile(settings.DEFAULT_PROFILE)
         self.audio_processor = AudioProcessor()
-        self.transcriber = Transcriber()
-        self.semantic_analyzer = SemanticAnalyzer()
+        # The default profile's models are loaded now and never evicted, so the
+        # common case pays no load time (and serve.py can share them across workers)
+        self.transcriber, self.semantic_analyzer = self._build_models(self.default_profile)
+        self.models.pin_all()
+        self.scene_detector = SceneDetector()
         self.decision_engine = DecisionEngine()
+        self.workspace = WorkspaceManager()
+        self.store = AnalysisStore()
 
-    def _get_video_duration(self, video_path: str) -> float:
+    def get_video_duration(self, video_path: str) -> float:
         """Get video duration using ffprobe (or ffmpeg)."""
         try:
             # ffprobe -v error -show_entries format=duration -of default=noprint_wrappers=1:nokey=1 input.mp4
@@ -34,48 +53,196 @@ class VideoAnalysisPipeline:
             # but usually they come together. For now return 0.0 on failure.
             return 0.0
 
-    def analyze_video(self, video_path: str) -> AnalysisResult:
+    def get_video_stream_info(self, video_path: str) -> Dict[str, Any]:
+        """Frame rate, size and codec of the first video stream (empty for audio-only files)."""
+        try:
+            command = [
+                "ffprobe",
+                "-v", "error",
+                "-select_streams", "v:0",
+                "-show_entries", "stream=codec_name,width,height,r_frame_rate",
+                "-of", "json",
+                video_path
+            ]
+            result = subprocess.run(command, capture_output=True, text=True, check=True)
+            streams = json.loads(result.stdout).get("streams", [])
+            if not streams:
+                return {}
+            stream = streams[0]
+            num, _, den = stream.get("r_frame_rate", "0/1").partition("/")
+            fps = float(num) / float(den) if den and float(den) else float(num or 0)
+            return {
+                "codec": stream.get("codec_name", ""),
+                "width": int(stream.get("width", 0)),
+                "height": int(stream.get("height", 0)),
+                "fps": fps,
+                "frame_rate": stream.get("r_frame_rate", "")
+            }
+        except Exception:
+            return {}
+
+    def _build_models(self, pipeline_profile: PipelineProfile):
+        """Transcriber and SemanticAnalyzer (None when the profile skips semantics) backed by the shared registry."""
+        transcriber = Transcriber(
+            pipeline_profile.whisper_model, self.models,
+            beam_size=pipeline_profile.beam_size, word_timestamps=pipeline_profile.word_timestamps
+        )
+        semantic_analyzer = None
+        if pipeline_profile.semantic:
+            semantic_analyzer = SemanticAnalyzer(pipeline_profile.embedding_model, self.models)
+        return transcriber, semantic_analyzer
+
+    def _models_for(self, pipeline_profile: PipelineProfile):
+        if pipeline_profile == self.default_profile:
+            return self.transcriber, self.semantic_analyzer
+        # Loaded on first use, then shared until evicted
+        return self._build_models(pipeline_profile)
+
+    def analyze_video(
+        self,
+        video_path: str,
+        duration: Optional[float] = None,
+        pipeline_profile: Optional[str] = None,
+        profiling: Optional[bool] = None,
+        source_name: Optional[str] = None
+    ) -> AnalysisResult:
+        result = None
+        for update in self.iter_analysis(
+            video_path, duration, pipeline_profile=pipeline_profile, profiling=profiling, source_name=source_name
+        ):
+            result = update.result
+        return result
+
+    def iter_analysis(
+        self,
+        video_path: str,
+        duration: Optional[float] = None,
+        pipeline_profile: Optional[str] = None,
+        profiling: Optional[bool] = None,
+        source_name: Optional[str] = None
+    ) -> Iterator[AnalysisUpdate]:
+        """
+        Runs the analysis stage by stage, yielding an AnalysisUpdate after each one.
+        The decision engine is re-run on whatever inputs are ready, so silence cuts
+        are available within seconds while transcription is still going. The final
+        update carries the AnalysisResult.
+
+        pipeline_profile names the models and stages to use ("fast", "balanced",
+        "accurate"; default settings.DEFAULT_PROFILE). profiling=True (default:
+        settings.PROFILE_REQUESTS) records a cProfile and per-stage timings for
+        this run, saved next to the analysis. source_name is the file name the user
+        knows the video by (default: video_path's), used by timeline exports.
+        """
         if not os.path.exists(video_path):
             raise FileNotFoundError(f"Video file not found: {video_path}")
+        selected = get_profile(pipeline_profile or "")
+
+        profiler = make_profiler(profiling)
+        try:
+            yield from self._run_stages(video_path, duration, selected, profiler, source_name or os.path.basename(video_path))
+        finally:
+            profiler.close()
 
+    def _run_stages(
+        self, video_path: str, duration: Optional[float], selected: PipelineProfile, profiler, source_name: str
+    ) -> Iterator[AnalysisUpdate]:
+        print(f"[DEBUG] Pipeline profile: {selected.name}")
+        # Assigned up front so artifacts (waveform) can be stored while the analysis runs
+        analysis_id = self.store.new_id()
         print(f"[DEBUG] VideoAnalysisPipeline received path: {video_path}")
         print(f"[DEBUG] File size: {os.path.getsize(video_path)} bytes")
         
-        # 0. Get Video Info (Duration)
-        duration = self._get_video_duration(video_path)
+        # 0. Get Video Info (Duration), unless the caller already probed it
+        with profiler.stage("probe"):
+            if duration is None:
+                duration = self.get_video_duration(video_path)
+            media_info = self.get_video_stream_info(video_path)
 
-        # 1. Audio Processing
-        print(f"INFO:ai.audio_extraction:Extracting audio from {video_path}...")
-        audio_path = self.audio_processor.extract_audio(video_path)
-        print("INFO:ai.audio_extraction:Audio extraction successful.")
-        
-        print(f"INFO:ai.audio_analysis:Loading audio file: {audio_path}")
-        silence_intervals = self.audio_processor.detect_silence(audio_path)
-        energy_peaks = self.audio_processor.get_high_energy_segments(audio_path, top_n=5)
-        print(f"INFO:ai.audio_analysis:Found {len(silence_intervals)} silence segments and {len(energy_peaks)} energy peaks.")
-
-        # 2. Transcription
-        print(f"INFO:ai.speech_to_text:Loading Whisper model '{settings.WHISPER_MODEL_SIZE}'...")
-        transcription_result = self.transcriber.transcribe(audio_path)
-        raw_segments = transcription_result.get("segments", [])
-        detected_language = transcription_result.get("language", "unknown")
-        
-        # 3. Semantic Analysis
-        print("INFO:ai.nlp_analysis:Loading SentenceTransformer model...")
-        video_segments = self.semantic_analyzer.analyze_segments(raw_segments)
-        redundancies = self.semantic_analyzer.find_redundancies(video_segments)
-        print(f"INFO:ai.nlp_analysis:Detected {len(redundancies)} redundancy pairs.")
-
-        # 4. Decision Engine
-        print(f"[DEBUG] Decisions inputs: Silences={len(silence_intervals)}, Segments={len(video_segments)}, Redundancies={len(redundancies)}, Peaks={len(energy_peaks)}")
-        suggestions = self.decision_engine.generate_suggestions(
-            silence_intervals, 
-            video_segments, 
-            redundancies,
-            energy_peaks,
-            duration
-        )
+        # Inputs of the decision engine, filled in as stages complete
+        silence_intervals = []
+        energy_peaks = []
+        segment_table = SegmentTable.empty()
+        redundancies = []
+        scene_boundaries = []
+        # suggestion_id -> last emitted to_dict(), to send only what changed
+        emitted = {}
+
+        # Scratch files (extracted audio) live in a per-job directory that is
+        # removed when the job ends, even on failure; `cleanup` likewise closes the
+        # snapper's audio reader, also when a stream client goes away mid-run
+        with self.workspace.job() as job, ExitStack() as cleanup:
+            # 1. Audio Processing
+            # (stages are timed only while they run, never while suspended at a yield)
+            with profiler.stage("audio_extraction"):
+                print(f"INFO:ai.audio_extraction:Extracting audio from {video_path}...")
+                job.reserve(self.audio_processor.estimate_wav_size(duration))
+                audio_path = self.audio_processor.extract_audio(video_path, output_dir=job.path)
+                print("INFO:ai.audio_extraction:Audio extraction successful.")
+
+            # Cut edges are snapped once the snapper is built, after the first results
+            snapper = None
+
+            with profiler.stage("silence"):
+                print(f"INFO:ai.audio_analysis:Loading audio file: {audio_path}")
+                silence_intervals = self.audio_processor.detect_silence(audio_path)
+            yield self._revise("silence", emitted, silence_intervals, segment_table, redundancies, energy_peaks, duration, scene_boundaries, profiler=profiler, snapper=snapper)[0]
+
+            with profiler.stage("energy"):
+                energy_peaks = self.audio_processor.get_high_energy_segments(audio_path, top_n=5)
+            print(f"INFO:ai.audio_analysis:Found {len(silence_intervals)} silence segments and {len(energy_peaks)} energy peaks.")
+            yield self._revise("energy", emitted, silence_intervals, segment_table, redundancies, energy_peaks, duration, scene_boundaries, profiler=profiler, snapper=snapper)[0]
+
+            # Optional snapping of cut edges to keyframes / frames / audio zero crossings.
+            # Built after the first yields so the keyframe scan doesn't delay them;
+            # the silence cuts already sent come back as revisions on the next update.
+            if settings.CUT_SNAP != "none":
+                with profiler.stage("keyframes"):
+                    snapper = self._make_snapper(video_path, audio_path, analysis_id)
+                if snapper is not None:
+                    cleanup.callback(snapper.close)
+
+            # Min/max/RMS pyramid for drawing the timeline, from the same mapped WAV
+            if settings.WAVEFORM:
+                with profiler.stage("waveform"):
+                    try:
+                        build_waveform(audio_path, self.store.path_for(analysis_id, WAVEFORM_FILE))
+                    except ValueError as e:
+                        print(f"[DEBUG] Skipping waveform: {e}")
+
+            # Visual scene changes (keyframes only, much faster than real time)
+            if selected.scene_detection:
+                with profiler.stage("visual"):
+                    scene_boundaries = self.scene_detector.detect_scenes(video_path)
+                yield self._revise("visual", emitted, silence_intervals, segment_table, redundancies, energy_peaks, duration, scene_boundaries, profiler=profiler, snapper=snapper)[0]
+
+            # 2. Transcription
+            with profiler.stage("transcription"):
+                print(f"INFO:ai.speech_to_text:Loading Whisper model '{selected.whisper_model}'...")
+                transcriber, semantic_analyzer = self._models_for(selected)
+                transcription_result = transcriber.transcribe(audio_path)
+                raw_segments = transcription_result.get("segments", [])
+                detected_language = transcription_result.get("language", "unknown")
+
+                # Keyword highlights and energy-peak context only need the text
+                segment_table = SegmentTable.from_transcript(raw_segments)
+            final_stage = "transcription"
         
+            # 3. Semantic Analysis (skipped by the fast profile)
+            if semantic_analyzer is not None:
+                yield self._revise("transcription", emitted, silence_intervals, segment_table, redundancies, energy_peaks, duration, scene_boundaries, profiler=profiler, snapper=snapper)[0]
+
+                with profiler.stage("semantic"):
+                    print("INFO:ai.nlp_analysis:Loading SentenceTransformer model...")
+                    segment_table = semantic_analyzer.analyze_segments(raw_segments)
+                with profiler.stage("redundancy"):
+                    redundancies = semantic_analyzer.find_redundancies(segment_table)
+                print(f"INFO:ai.nlp_analysis:Detected {len(redundancies)} redundancy pairs.")
+                final_stage = "semantic"
+
+            # 4. Decision Engine
+            print(f"[DEBUG] Decisions inputs: Silences={len(silence_intervals)}, Segments={len(segment_table)}, Redundancies={len(redundancies)}, Peaks={len(energy_peaks)}, Scenes={len(scene_boundaries)}")
+            update, suggestions = self._revise(final_stage, emitted, silence_intervals, segment_table, redundancies, energy_peaks, duration, scene_boundaries, profiler=profiler, snapper=snapper)
+
         # 5. Final Packaging
         result = AnalysisResult(
             video_path=video_path,
@@ -83,15 +250,51 @@ class VideoAnalysisPipeline:
             language=detected_language,
             transcript=raw_segments,
             silence_segments=silence_intervals,
-            suggestions=suggestions
+            suggestions=suggestions,
+            analysis_id=analysis_id,
+            media_info=media_info,
+            profile=selected.name,
+            source_name=source_name
         )
         
-        # Save output
-        output_filename = os.path.basename(video_path) + ".json"
-        output_path = os.path.join(settings.OUTPUT_DIR, output_filename)
-        
-        # Just creating the json dict, we won't verify write here to keep it clean
-        # but matching the style of returning it
+        # Save output (OUTPUT_DIR/<analysis_id>/analysis.json) so it can be exported later
+        with profiler.stage("save"):
+            output_path = self.store.save(result)
+            # Columnar binary transcript for /analysis/{id}/transcript
+            self.store.write_artifact(analysis_id, TRANSCRIPT_FILE, encode_transcript(raw_segments, detected_language))
+        profiler.save(self.store, result.analysis_id)
         
-        print(f"INFO:ai.analyzer:Analysis completed.")
-        return result
+        print(f"INFO:ai.analyzer:Analysis completed. Saved to {output_path}")
+        update.result = result
+        yield update
+
+    def _make_snapper(self, video_path: str, audio_path: str, analysis_id: str) -> Optional[BoundarySnapper]:
+        if settings.CUT_SNAP == "zero_crossing":
+            reader = open_pcm(audio_path, sample_rate=self.audio_processor.sample_rate)
+            return BoundarySnapper("zero_crossing", audio=reader) if reader is not None else None
+        try:
+            # One ffprobe pass, cached next to the analysis for later renders
+            keyframes = KeyframeIndex.load_or_build(video_path, self.store.path_for(analysis_id, KEYFRAMES_FILE))
+        except Exception as e:
+            print(f"[DEBUG] Keyframe index unavailable, cuts are not snapped: {e}")
+            return None
+        return BoundarySnapper(settings.CUT_SNAP, keyframes=keyframes)
+
+    def _revise(self, stage: str, emitted: Dict[str, Dict[str, Any]], *engine_inputs, profiler=NULL_PROFILER, snapper=None):
+        """
+        Re-runs the decision engine on the inputs available so far and diffs the
+        suggestions against what was already emitted (by suggestion_id).
+        Returns (AnalysisUpdate, suggestions).
+        """
+        with profiler.stage("decision"):
+            suggestions = self.decision_engine.generate_suggestions(*engine_inputs, snapper=snapper)
+
+            current = {s.suggestion_id: s for s in suggestions}
+            changed = [s for sid, s in current.items() if emitted.get(sid) != s.to_dict()]
+            removed = [sid for sid in emitted if sid not in current]
+
+            emitted.clear()
+            emitted.update((sid, s.to_dict()) for sid, s in current.items())
+
+        print(f"INFO:ai.analyzer:Stage '{stage}' done: {len(changed)} new/revised, {len(removed)} withdrawn suggestions.")
+        return AnalysisUpdate(stage=stage, changed=changed, removed=removed), suggestions
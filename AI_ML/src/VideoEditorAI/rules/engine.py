@@ -1,19 +1,40 @@
-from typing import List, Dict
-from VideoEditorAI.core.models import VideoSegment, EditingSuggestion, SegmentType, AnalysisResult
+import bisect
+import hashlib
+from typing import List, Dict, Optional
+from VideoEditorAI.core.models import SegmentTable, EditingSuggestion, SegmentType, AnalysisResult
 from VideoEditorAI.core.config import settings
 
 class DecisionEngine:
     def generate_suggestions(
         self,
         silence_intervals: List[tuple],
-        semantic_segments: List[VideoSegment],
+        semantic_segments: SegmentTable,
         redundancies: List[tuple],
         energy_peaks: List[tuple],
-        duration: float
+        duration: float,
+        scene_boundaries: Optional[List[float]] = None,
+        snapper=None
     ) -> List[EditingSuggestion]:
+        """
+        Runs every rule on the given inputs. Inputs that aren't available yet can
+        be passed empty (progressive analysis re-runs this as each stage finishes).
+        snapper (a BoundarySnapper) moves cut edges onto keyframes, frames or zero
+        crossings before the final pass, so transitions are placed on the snapped edges.
+        """
+        scene_boundaries = sorted(scene_boundaries or [])
         suggestions = []
+        suggestions += self.silence_cuts(silence_intervals)
+        suggestions += self.redundancy_cuts(semantic_segments, redundancies)
+        suggestions += self.keyword_highlights(semantic_segments)
+        suggestions += self.energy_highlights(energy_peaks, semantic_segments, suggestions)
+        self.snap_cuts_to_scenes(suggestions, scene_boundaries)
+        if snapper is not None:
+            snapper.snap_suggestions(suggestions)
+        return self.finalize(suggestions, scene_boundaries)
 
+    def silence_cuts(self, silence_intervals: List[tuple]) -> List[EditingSuggestion]:
         # 1. Processing Silence
+        suggestions = []
         for start, end in silence_intervals:
             if (end - start) >= settings.MIN_SILENCE_DURATION:
                 suggestions.append(EditingSuggestion(
@@ -21,53 +42,66 @@ class DecisionEngine:
                     start_time=start,
                     end_time=end,
                     confidence=0.9, # High confidence for silence
-                    reason=f"Found a quiet part/silence ({round(end-start, 1)}s)"
+                    reason=f"Found a quiet part/silence ({round(end-start, 1)}s)",
+                    origin=f"silence:{start:.3f}-{end:.3f}"
                 ))
+        return suggestions
 
+    def redundancy_cuts(self, semantic_segments: SegmentTable, redundancies: List[tuple]) -> List[EditingSuggestion]:
         # 2. Processing Redundancies
         # redundancies is list of (idx1, idx2) where idx2 is redundant
+        suggestions = []
         for idx1, idx2 in redundancies:
             # We assume semantic_segments corresponds to the original transcript list order
             # but we need to be careful with indices if we were modifying the list.
             # Here we just flag the second occurrence.
-            
+
             # Sanity check indices
             if idx1 >= len(semantic_segments) or idx2 >= len(semantic_segments):
                 continue
 
-            seg_original = semantic_segments[idx1]
-            seg_redundant = semantic_segments[idx2]
-            
+            # Read straight from the table columns instead of building row objects
             suggestions.append(EditingSuggestion(
                 suggestion_type=SegmentType.CUT,
-                start_time=seg_redundant.start_time,
-                end_time=seg_redundant.end_time,
+                start_time=float(semantic_segments.starts[idx2]),
+                end_time=float(semantic_segments.ends[idx2]),
                 confidence=0.8,
-                reason=f"You're repeating yourself (similar to what you said at {round(seg_original.start_time, 1)}s)"
+                reason=f"You're repeating yourself (similar to what you said at {round(float(semantic_segments.starts[idx1]), 1)}s)",
+                origin=f"redundancy:{idx2}"
             ))
+        return suggestions
 
+    def keyword_highlights(self, semantic_segments: SegmentTable) -> List[EditingSuggestion]:
         # 3. Semantic Highlights (Keyword based)
         highlight_keywords = ["amazing", "important", "key takeaway", "don't forget"]
-        semantic_highlight_found = False
-        
-        for seg in semantic_segments:
-            if seg.text and any(k in seg.text.lower() for k in highlight_keywords):
+        suggestions = []
+
+        for i, text in enumerate(semantic_segments.texts):
+            if text and any(k in text.lower() for k in highlight_keywords):
                  suggestions.append(EditingSuggestion(
                     suggestion_type=SegmentType.HIGHLIGHT,
-                    start_time=seg.start_time,
-                    end_time=seg.end_time,
+                    start_time=float(semantic_segments.starts[i]),
+                    end_time=float(semantic_segments.ends[i]),
                     confidence=0.7,
-                    reason=f"Important word mentioned: '{seg.text[:20]}...'"
+                    reason=f"Important word mentioned: '{text[:20]}...'",
+                    origin=f"keyword:{i}"
                 ))
-                 semantic_highlight_found = True
+        return suggestions
 
+    def energy_highlights(
+        self,
+        energy_peaks: List[tuple],
+        semantic_segments: SegmentTable,
+        existing_suggestions: List[EditingSuggestion]
+    ) -> List[EditingSuggestion]:
         # 4. Energy Highlights (Fallback or Additive)
         # If we didn't find specific semantic highlights, use energy peaks
         # Or we can just include them as "High Energy" segments
+        suggestions = []
         for start, end in energy_peaks:
             # Check for overlaps with existing suggestions
             is_redundant = False
-            for existing in suggestions:
+            for existing in existing_suggestions + suggestions:
                 # If they overlap more than 50%, or if the start/end is within another
                 ov_start = max(start, existing.start_time)
                 ov_end = min(end, existing.end_time)
@@ -76,18 +110,14 @@ class DecisionEngine:
                     if overlap_duration > 1.0: # If they overlap by more than 1 second
                         is_redundant = True
                         break
-            
+
             if not is_redundant:
                 # NEW: Try to find semantic context for this energy peak
                 context_text = ""
-                for seg in semantic_segments:
-                    # Check for overlap
-                    ov_start = max(start, seg.start_time)
-                    ov_end = min(end, seg.end_time)
-                    if ov_start < ov_end:
-                        context_text = seg.text
-                        break
-                
+                overlapping = semantic_segments.overlapping(start, end)
+                if len(overlapping):
+                    context_text = semantic_segments.texts[overlapping[0]]
+
                 reason = "You talked louder here (potential highlight)"
                 if context_text:
                     reason = f"Captured an important moment: \"{context_text[:50]}...\""
@@ -97,12 +127,39 @@ class DecisionEngine:
                     start_time=start,
                     end_time=end,
                     confidence=0.6,
-                    reason=reason
+                    reason=reason,
+                    origin=f"energy:{start:.3f}-{end:.3f}"
                 ))
+        return suggestions
 
+    def snap_cuts_to_scenes(self, suggestions: List[EditingSuggestion], scene_boundaries: List[float]):
+        """
+        Moves CUT edges onto a nearby visual scene change, where a cut is least noticeable.
+        Edges only move inward (start later, end earlier): widening a cut could remove
+        speech just outside the silence or segment it was made from.
+        """
+        if not scene_boundaries:
+            return
+        tolerance = settings.SCENE_SNAP_TOLERANCE
+        for s in suggestions:
+            if s.suggestion_type != SegmentType.CUT:
+                continue
+            # First scene change at or after the start, last one at or before the end
+            i = bisect.bisect_left(scene_boundaries, s.start_time)
+            start = scene_boundaries[i] if i < len(scene_boundaries) and scene_boundaries[i] - s.start_time <= tolerance else None
+            j = bisect.bisect_right(scene_boundaries, s.end_time) - 1
+            end = scene_boundaries[j] if j >= 0 and s.end_time - scene_boundaries[j] <= tolerance else None
+            if start is not None and start < s.end_time:
+                s.start_time = start
+            if end is not None and end > s.start_time:
+                s.end_time = end
+
+    def finalize(self, suggestions: List[EditingSuggestion], scene_boundaries: Optional[List[float]] = None) -> List[EditingSuggestion]:
+        """Sorts, de-duplicates, adds transitions and assigns stable suggestion IDs."""
+        scene_boundaries = scene_boundaries or []
         # Sort suggestions by start time
-        suggestions.sort(key=lambda s: s.start_time)
-        
+        suggestions = sorted(suggestions, key=lambda s: s.start_time)
+
         # Final pass: Ensure no two suggestions start at the exact same time
         unique_suggestions = []
         seen_starts = set()
@@ -112,7 +169,7 @@ class DecisionEngine:
             if rounded_start not in seen_starts:
                 unique_suggestions.append(s)
                 seen_starts.add(rounded_start)
-        
+
         # Add transition suggestions between far highlights
         final_suggestions = list(unique_suggestions)
         for i in range(len(unique_suggestions) - 1):
@@ -120,21 +177,52 @@ class DecisionEngine:
             nxt = unique_suggestions[i+1]
             gap = nxt.start_time - curr.end_time
             if gap > 2.0: # If there's more than 2s gap between suggestions
-                final_suggestions.append(EditingSuggestion(
-                    suggestion_type=SegmentType.TRANSITION,
-                    start_time=curr.end_time - 0.5,
-                    end_time=curr.end_time + 0.5,
-                    confidence=0.5,
-                    reason="Add a smooth transition (like a fade) between these parts"
-                ))
+                # Prefer placing the transition on a visual scene change inside the gap
+                i_scene = bisect.bisect_right(scene_boundaries, curr.end_time)
+                if i_scene < len(scene_boundaries) and scene_boundaries[i_scene] < nxt.start_time:
+                    scene_time = scene_boundaries[i_scene]
+                    final_suggestions.append(EditingSuggestion(
+                        suggestion_type=SegmentType.TRANSITION,
+                        start_time=scene_time - 0.5,
+                        end_time=scene_time + 0.5,
+                        confidence=0.6,
+                        reason="Add a smooth transition here, the scene changes",
+                        origin=f"transition:{curr.origin}"
+                    ))
+                else:
+                    final_suggestions.append(EditingSuggestion(
+                        suggestion_type=SegmentType.TRANSITION,
+                        start_time=curr.end_time - 0.5,
+                        end_time=curr.end_time + 0.5,
+                        confidence=0.5,
+                        reason="Add a smooth transition (like a fade) between these parts",
+                        origin=f"transition:{curr.origin}"
+                    ))
             elif curr.suggestion_type == SegmentType.CUT:
                  final_suggestions.append(EditingSuggestion(
                     suggestion_type=SegmentType.TRANSITION,
                     start_time=curr.start_time,
                     end_time=curr.start_time + 0.1,
                     confidence=0.4,
-                    reason="Try a quick 'Jump Cut' here"
+                    reason="Try a quick 'Jump Cut' here",
+                    origin=f"jump_cut:{curr.origin}"
                 ))
 
         final_suggestions.sort(key=lambda s: s.start_time)
+        self.assign_ids(final_suggestions)
         return final_suggestions
+
+    def assign_ids(self, suggestions: List[EditingSuggestion]):
+        """
+        Gives each suggestion an ID derived from its origin (the rule and the input it
+        came from, e.g. the silence interval or transcript segment), not from its times.
+        The same edit keeps its ID when suggestions are recomputed with more inputs,
+        even if scene or keyframe snapping moves its edges; only its times change.
+        """
+        seen: Dict[str, int] = {}
+        for s in suggestions:
+            key = f"{s.suggestion_type.value}:{s.origin}"
+            base = f"{s.suggestion_type.value}-{hashlib.sha1(key.encode()).hexdigest()[:10]}"
+            count = seen.get(base, 0)
+            seen[base] = count + 1
+            s.suggestion_id = base if count == 0 else f"{base}-{count}"
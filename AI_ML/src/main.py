@@ -7,11 +7,20 @@ sys.path.append(os.path.join(os.path.dirname(__file__), "VideoEditorAI"))
 
 from VideoEditorAI.pipeline import VideoAnalysisPipeline
 from VideoEditorAI.chat.llm import EditingAssistant
+from VideoEditorAI.export.timeline import keep_intervals, to_edl, to_fcpxml
+from VideoEditorAI.export.render import RoughCutRenderer
+from VideoEditorAI.core.profiles import PROFILES
+from VideoEditorAI.analysis.keyframes import KeyframeIndex, KEYFRAMES_FILE
 
 def main():
     parser = argparse.ArgumentParser(description="AI Video Editing Assistant")
     parser.add_argument("--video", type=str, required=True, help="Path to the input video file")
     parser.add_argument("--chat", action="store_true", help="Enable chat mode after analysis")
+    parser.add_argument("--profile", type=str, choices=list(PROFILES), help="Pipeline profile (models/stages), default from Config")
+    parser.add_argument("--export-edl", type=str, help="Write a CMX3600 EDL of the video without the suggested cuts")
+    parser.add_argument("--export-fcpxml", type=str, help="Write an FCPXML timeline of the video without the suggested cuts")
+    parser.add_argument("--render", type=str, help="Render a rough cut (suggested cuts removed) to this file")
+    parser.add_argument("--exact", action="store_true", help="With --render: cut exactly, re-encoding only the frames up to the next keyframe")
     
     args = parser.parse_args()
     
@@ -24,7 +33,7 @@ def main():
     print(f"\n=== Processing {video_path} ===\n")
     pipeline = VideoAnalysisPipeline()
     try:
-        result = pipeline.analyze_video(video_path)
+        result = pipeline.analyze_video(video_path, pipeline_profile=args.profile)
     except Exception as e:
         print(f"\nCRITICAL ERROR during analysis: {e}")
         return
@@ -36,7 +45,32 @@ def main():
     import json
     print(json.dumps(result.to_json(), indent=4))
 
-    # 3. Chat Mode
+    # 3. Export / Render
+    intervals = keep_intervals(result.suggestions, result.duration)
+    fps = result.media_info.get("fps") or 30.0
+    if args.export_edl:
+        with open(args.export_edl, "w", encoding="utf-8") as f:
+            f.write(to_edl(intervals, video_path, fps=fps))
+        print(f"EDL written to {args.export_edl}")
+    if args.export_fcpxml:
+        with open(args.export_fcpxml, "w", encoding="utf-8") as f:
+            f.write(to_fcpxml(
+                intervals, os.path.abspath(video_path), result.duration, fps=fps,
+                width=result.media_info.get("width") or 1920, height=result.media_info.get("height") or 1080
+            ))
+        print(f"FCPXML written to {args.export_fcpxml}")
+    if args.render:
+        try:
+            # Reuses the keyframe index cached with the analysis (probed once otherwise)
+            keyframes = KeyframeIndex.load_or_build(video_path, pipeline.store.path_for(result.analysis_id, KEYFRAMES_FILE))
+            RoughCutRenderer(pipeline.workspace).render(
+                video_path, intervals, args.render, exact=args.exact, keyframes=keyframes, media_info=result.media_info
+            )
+            print(f"Rough cut rendered to {args.render}")
+        except Exception as e:
+            print(f"\nERROR while rendering: {e}")
+
+    # 4. Chat Mode
     if args.chat:
         print("\n=== Chat Mode (Local LLM) ===")
         print("Type 'exit' to quit. Ask about the editing suggestions or general questions.")
@@ -0,0 +1,211 @@
+import asyncio
+import os
+import sys
+import types
+
+import pytest
+
+# Add src to path
+sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+
+from VideoEditorAI.core import admission as admission_module
+from VideoEditorAI.core.admission import AdmissionController, AdmissionRejected
+
+def make_controller(**kwargs) -> AdmissionController:
+    # One media second costs one CPU-second; no minimum, no aging unless asked
+    options = dict(cpu_budget=100.0, cost_per_media_second=1.0, max_queue=8, aging=0.0)
+    options.update(kwargs)
+    controller = AdmissionController(**options)
+    return controller
+
+@pytest.fixture
+def no_min_cost(monkeypatch):
+    monkeypatch.setattr(admission_module.settings, "ADMISSION_MIN_COST", 0.0)
+
+@pytest.fixture
+def clock(monkeypatch):
+    # Fake clock for the aging priority only (asyncio keeps the real one)
+    now = [1000.0]
+    monkeypatch.setattr(admission_module, "time", types.SimpleNamespace(monotonic=lambda: now[0]))
+    return now
+
+async def settle():
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+def test_runs_immediately_within_budget(no_min_cost):
+    async def scenario():
+        controller = make_controller()
+        a = await controller.acquire(40)
+        b = await controller.acquire(60)
+        assert controller.stats()["running"] == 2
+        assert controller.stats()["in_flight_cost"] == 100.0
+        controller.release(a)
+        controller.release(b)
+        assert controller.stats()["running"] == 0
+
+    asyncio.run(scenario())
+
+def test_queue_admits_cheapest_first(no_min_cost):
+    async def scenario():
+        controller = make_controller()
+        order = []
+        first = await controller.acquire(100)
+
+        async def job(name, duration):
+            cost = await controller.acquire(duration)
+            order.append(name)
+            controller.release(cost)
+
+        tasks = [asyncio.create_task(job(name, d)) for name, d in (("long", 90), ("short", 10), ("mid", 50))]
+        await settle()
+        assert order == []
+        assert controller.stats()["queued"] == 3
+
+        controller.release(first)
+        await asyncio.gather(*tasks)
+        assert order == ["short", "mid", "long"]
+
+    asyncio.run(scenario())
+
+def test_fast_path_only_for_jobs_ahead_of_the_queue(no_min_cost, clock):
+    async def scenario():
+        controller = make_controller(aging=1.0)
+        running = await controller.acquire(85)
+        head = asyncio.create_task(controller.acquire(20))
+        await settle()
+        assert not head.done()
+
+        # Cheaper than the queued head and fits the 15 left: runs straight away
+        cheap = await controller.acquire(10)
+        assert controller.stats()["running"] == 2
+
+        # Also cheaper and would fit, but the head has now waited long enough
+        # to outrank it, so it queues behind instead of starving the head
+        controller.release(cheap)
+        clock[0] += 10
+        late = asyncio.create_task(controller.acquire(15))
+        await settle()
+        assert not late.done()
+
+        controller.release(running)
+        await settle()
+        assert head.done() and late.done()
+        controller.release(head.result())
+        controller.release(late.result())
+
+    asyncio.run(scenario())
+
+def test_oversized_job_runs_alone(no_min_cost):
+    async def scenario():
+        controller = make_controller()
+        small = await controller.acquire(10)
+        big = asyncio.create_task(controller.acquire(500))
+        await settle()
+        assert not big.done()
+        controller.release(small)
+        await settle()
+        assert big.done()
+        assert controller.stats()["running"] == 1
+        controller.release(big.result())
+
+    asyncio.run(scenario())
+
+def test_aging_prevents_starvation(no_min_cost, clock):
+    async def run(aging):
+        controller = make_controller(aging=aging, max_queue=1000)
+        running = [await controller.acquire(60)]
+        big = asyncio.create_task(controller.acquire(500))
+        await settle()
+        # A steady stream of short clips, one every 5 seconds; only one fits the
+        # budget at a time, so there is always a short clip queued next to the big one
+        for i in range(200):
+            short = asyncio.create_task(controller.acquire(60))
+            clock[0] += 5
+            await settle()
+            controller.release(running.pop())
+            await settle()
+            if big.done():
+                controller.release(big.result())
+                await settle()
+                controller.release((await short))
+                return i
+            running.append(await short)
+        controller.release(running.pop())
+        await settle()
+        controller.release(big.result())
+        return None
+
+    # Without aging the big job waits as long as short clips keep coming
+    assert asyncio.run(run(0.0)) is None
+    # With aging it overtakes once it has waited about its extra cost in seconds
+    waited = asyncio.run(run(1.0))
+    assert waited is not None and 80 <= waited <= 100
+
+def test_cancel_while_queued(no_min_cost):
+    async def scenario():
+        controller = make_controller()
+        running = await controller.acquire(100)
+        waiter = asyncio.create_task(controller.acquire(30))
+        await settle()
+        assert controller.stats()["queued"] == 1
+
+        waiter.cancel()
+        await settle()
+        assert controller.stats()["queued"] == 0
+        assert controller.stats()["queued_cost"] == 0.0
+
+        controller.release(running)
+        assert controller.stats()["running"] == 0
+        # The cancelled entry is skipped, not admitted
+        assert controller.stats()["admitted_total"] == 1
+
+    asyncio.run(scenario())
+
+def test_cancel_right_after_admission_releases_the_slot(no_min_cost):
+    async def scenario():
+        controller = make_controller()
+        running = await controller.acquire(100)
+        waiter = asyncio.create_task(controller.acquire(30))
+        await settle()
+
+        # Admitted (future resolved) but the task is cancelled before it resumes
+        controller.release(running)
+        waiter.cancel()
+        await settle()
+        assert waiter.cancelled()
+        assert controller.stats()["running"] == 0
+        assert controller.stats()["in_flight_cost"] == 0.0
+
+    asyncio.run(scenario())
+
+def test_rejects_when_queue_is_full(no_min_cost):
+    async def scenario():
+        controller = make_controller(max_queue=2)
+        running = await controller.acquire(100)
+        waiters = [asyncio.create_task(controller.acquire(10)) for _ in range(2)]
+        await settle()
+
+        with pytest.raises(AdmissionRejected) as rejected:
+            await controller.acquire(10)
+        assert rejected.value.retry_after >= 1
+        assert controller.stats()["rejected_total"] == 1
+
+        controller.release(running)
+        await settle()
+        for w in waiters:
+            controller.release(w.result())
+
+    asyncio.run(scenario())
+
+def test_admit_context_releases_on_error(no_min_cost):
+    async def scenario():
+        controller = make_controller()
+        with pytest.raises(RuntimeError):
+            async with controller.admit(50):
+                assert controller.stats()["running"] == 1
+                raise RuntimeError("analysis failed")
+        assert controller.stats()["running"] == 0
+        assert controller.stats()["in_flight_cost"] == 0.0
+
+    asyncio.run(scenario())
@@ -0,0 +1,106 @@
+import os
+import struct
+import sys
+import wave
+
+import numpy as np
+import pytest
+
+# Add src to path
+sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+
+from VideoEditorAI.analysis.pcm import PCMReader, open_pcm
+
+librosa = pytest.importorskip("librosa")
+
+SR = 16000
+
+def make_signal(n_samples: int, seed: int = 0) -> np.ndarray:
+    """Speech-like test signal: a tone with bursts of noise and a stretch of silence."""
+    rng = np.random.default_rng(seed)
+    t = np.arange(n_samples) / SR
+    y = 0.3 * np.sin(2 * np.pi * 220 * t) * (1 + np.sin(2 * np.pi * 0.7 * t))
+    y += 0.05 * rng.standard_normal(n_samples)
+    y[n_samples // 3: n_samples // 2] = 0.0
+    return np.clip(y * 32767, -32768, 32767).astype("<i2")
+
+def write_wav(path: str, samples: np.ndarray):
+    with wave.open(path, "wb") as w:
+        w.setnchannels(1)
+        w.setsampwidth(2)
+        w.setframerate(SR)
+        w.writeframes(samples.tobytes())
+
+def patch_data_size(path: str, size: int):
+    """Overwrites the data chunk's size field, as streamed writers leave it."""
+    with open(path, "r+b") as f:
+        header = f.read(256)
+        pos = header.index(b"data")
+        f.seek(pos + 4)
+        f.write(struct.pack("<I", size))
+
+def librosa_rms(samples: np.ndarray, frame_length: int, hop_length: int) -> np.ndarray:
+    y = samples.astype(np.float32) / 32768.0
+    return librosa.feature.rms(y=y, frame_length=frame_length, hop_length=hop_length, center=True)[0]
+
+@pytest.mark.parametrize("n_samples", [SR * 3 + 123, 1500, 512 * 40])
+@pytest.mark.parametrize("frame_length,hop_length", [(2048, 512), (1024, 256)])
+def test_frame_rms_matches_librosa(tmp_path, n_samples, frame_length, hop_length):
+    samples = make_signal(n_samples)
+    path = str(tmp_path / "audio.wav")
+    write_wav(path, samples)
+
+    with PCMReader(path) as reader:
+        assert reader.sample_rate == SR
+        assert len(reader) == n_samples
+        # Small blocks so the block seams get exercised too
+        ours = reader.frame_rms(frame_length, hop_length, frames_per_block=7)
+
+    expected = librosa_rms(samples, frame_length, hop_length)
+    assert ours.shape == expected.shape
+    np.testing.assert_allclose(ours, expected, rtol=1e-4, atol=1e-6)
+
+@pytest.mark.parametrize("declared_size", [0xFFFFFFFF, 0x7FFFFFFF])
+def test_streamed_data_size_is_clamped_to_file(tmp_path, declared_size):
+    samples = make_signal(SR * 2 + 77, seed=1)
+    path = str(tmp_path / "streamed.wav")
+    write_wav(path, samples)
+    patch_data_size(path, declared_size)
+
+    with PCMReader(path) as reader:
+        assert len(reader) == len(samples)
+        np.testing.assert_array_equal(reader.samples, samples)
+        ours = reader.frame_rms()
+
+    np.testing.assert_allclose(ours, librosa_rms(samples, 2048, 512), rtol=1e-4, atol=1e-6)
+
+def test_truncated_file_reads_what_is_on_disk(tmp_path):
+    samples = make_signal(SR * 2, seed=2)
+    path = str(tmp_path / "truncated.wav")
+    write_wav(path, samples)
+    # Writer died mid-sample: the header still claims the full length
+    with open(path, "r+b") as f:
+        f.truncate(os.path.getsize(path) - 1001)
+
+    with PCMReader(path) as reader:
+        kept = samples[:len(reader)]
+        assert len(reader) == len(samples) - 501
+        ours = reader.frame_rms()
+
+    np.testing.assert_allclose(ours, librosa_rms(kept, 2048, 512), rtol=1e-4, atol=1e-6)
+
+def test_open_pcm_rejects_other_layouts(tmp_path):
+    path = str(tmp_path / "stereo.wav")
+    with wave.open(path, "wb") as w:
+        w.setnchannels(2)
+        w.setsampwidth(2)
+        w.setframerate(SR)
+        w.writeframes(b"\0" * 4000)
+    assert open_pcm(path) is None
+
+    mono = str(tmp_path / "mono.wav")
+    write_wav(mono, make_signal(1000))
+    assert open_pcm(mono, sample_rate=22050) is None
+    reader = open_pcm(mono, sample_rate=SR)
+    assert reader is not None
+    reader.close()
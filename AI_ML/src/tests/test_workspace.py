@@ -0,0 +1,108 @@
+import os
+import subprocess
+import sys
+import threading
+
+import pytest
+
+# Add src to path
+sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+
+from VideoEditorAI.core.workspace import QuotaExceededError, WorkspaceManager
+
+def dead_pid() -> int:
+    proc = subprocess.Popen([sys.executable, "-c", "pass"])
+    proc.wait()
+    return proc.pid
+
+def write_file(path: str, nbytes: int):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "wb") as f:
+        f.write(b"\0" * nbytes)
+
+def test_job_directory_is_isolated_and_removed(tmp_path):
+    manager = WorkspaceManager(root=str(tmp_path), quota_bytes=1000, use_tmpfs=False)
+    with manager.job() as a, manager.job() as b:
+        assert a.path != b.path
+        assert os.path.basename(a.path).startswith(f"{os.getpid()}-")
+        write_file(a.path_for("audio.wav"), 10)
+    assert not os.path.exists(a.path) and not os.path.exists(b.path)
+
+def test_concurrent_reservations_cannot_exceed_quota(tmp_path):
+    manager = WorkspaceManager(root=str(tmp_path), quota_bytes=1000, use_tmpfs=False)
+    barrier = threading.Barrier(4)
+    outcomes = []
+
+    def worker():
+        with manager.job() as job:
+            barrier.wait()
+            try:
+                job.reserve(400)
+                outcomes.append("ok")
+            except QuotaExceededError:
+                outcomes.append("rejected")
+            # Hold the reservation until every worker has tried
+            barrier.wait()
+
+    threads = [threading.Thread(target=worker) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert outcomes.count("ok") == 2
+    assert outcomes.count("rejected") == 2
+
+def test_reservation_counts_only_unwritten_bytes(tmp_path):
+    manager = WorkspaceManager(root=str(tmp_path), quota_bytes=1000, use_tmpfs=False)
+    with manager.job() as job:
+        job.reserve(600)
+        write_file(job.path_for("audio.wav"), 400)
+        usage = manager.usage()
+        assert usage["bytes_used"] == 400
+        assert usage["reserved_bytes"] == 200
+        with pytest.raises(QuotaExceededError):
+            job.reserve(500)
+
+def test_reservation_released_when_job_exits(tmp_path):
+    manager = WorkspaceManager(root=str(tmp_path), quota_bytes=1000, use_tmpfs=False)
+    with manager.job() as job:
+        job.reserve(900)
+        assert manager.usage()["reserved_bytes"] == 900
+    assert manager.usage()["reserved_bytes"] == 0
+    assert manager.usage()["active_jobs"] == 0
+
+    with manager.job() as job:
+        job.reserve(900)
+
+def test_reservation_released_when_job_fails(tmp_path):
+    manager = WorkspaceManager(root=str(tmp_path), quota_bytes=1000, use_tmpfs=False)
+    with pytest.raises(RuntimeError):
+        with manager.job() as job:
+            job.reserve(900)
+            raise RuntimeError("analysis failed")
+    assert manager.usage()["reserved_bytes"] == 0
+
+def test_stale_dirs_evicted_live_ones_kept(tmp_path):
+    manager = WorkspaceManager(root=str(tmp_path), quota_bytes=1000, use_tmpfs=False)
+    stale = os.path.join(str(tmp_path), f"{dead_pid()}-crashed")
+    # Left by another worker process that is still running
+    live = os.path.join(str(tmp_path), f"{os.getppid()}-running")
+    write_file(os.path.join(stale, "audio.wav"), 500)
+    write_file(os.path.join(live, "audio.wav"), 300)
+
+    with manager.job() as job:
+        job.reserve(600)
+        assert manager.usage()["evicted_files_total"] == 1
+
+    assert not os.path.exists(stale)
+    assert os.path.exists(os.path.join(live, "audio.wav"))
+
+def test_live_dirs_are_never_evicted(tmp_path):
+    manager = WorkspaceManager(root=str(tmp_path), quota_bytes=1000, use_tmpfs=False)
+    with manager.job() as running:
+        write_file(running.path_for("audio.wav"), 800)
+        with manager.job() as job:
+            with pytest.raises(QuotaExceededError):
+                job.reserve(300)
+        assert os.path.exists(running.path_for("audio.wav"))
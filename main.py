@@ -1,11 +1,18 @@
 import os
 import sys
+import json
 import shutil
+import time
 import tempfile
 import uuid
+import zlib
+import anyio
 from typing import Optional
-from fastapi import FastAPI, UploadFile, File, HTTPException
+from fastapi import FastAPI, UploadFile, File, HTTPException, Request, Header
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse, Response
+from starlette.background import BackgroundTask
+from starlette.concurrency import run_in_threadpool, iterate_in_threadpool
 from pydantic import BaseModel
 
 # Add AI_ML/src to path so we can import VideoEditorAI
@@ -14,8 +21,15 @@ sys.path.append(AI_SRC_PATH)
 
 # Import existing AI components
 try:
+    from VideoEditorAI.core.admission import AdmissionController, AdmissionRejected
     from VideoEditorAI.pipeline import VideoAnalysisPipeline
     from VideoEditorAI.chat.llm import EditingAssistant
+    from VideoEditorAI.export.timeline import keep_intervals, to_edl, to_fcpxml
+    from VideoEditorAI.core.uploads import UploadManager
+    from VideoEditorAI.core.profiling import PROFILE_JSON, PROFILE_STATS, PROFILE_TEXT
+    from VideoEditorAI.core.profiles import get_profile
+    from VideoEditorAI.analysis.waveform import WAVEFORM_FILE, read_index
+    from VideoEditorAI.export.transcript import TRANSCRIPT_FILE
     
     print("Initializing Global AI Pipeline (this may take a moment)...")
     global_pipeline = VideoAnalysisPipeline()
@@ -29,6 +43,10 @@ except ImportError as e:
 
 app = FastAPI(title="AI Video Editing Assistant Backend")
 
+# Limits how much analysis work runs at once; the rest is queued (short clips first)
+admission = AdmissionController() if global_pipeline is not None else None
+uploads = UploadManager() if global_pipeline is not None else None
+
 # Enable CORS for React frontend
 app.add_middleware(
     CORSMiddleware,
@@ -40,6 +58,11 @@ app.add_middleware(
 
 # --- Pydantic Models for Requests ---
 
+class CreateUploadRequest(BaseModel):
+    filename: str
+    total_size: int
+    chunk_size: Optional[int] = None
+
 class ChatRequest(BaseModel):
     message: str
     analysis_summary: Optional[dict] = None
@@ -66,6 +89,102 @@ LANGUAGE_MAP = {
 def get_language_name(code: str) -> str:
     return LANGUAGE_MAP.get(code.lower(), code.capitalize())
 
+def wants_profiling(x_profile: Optional[str]) -> Optional[bool]:
+    """X-Profile: 1 profiles this request; without the header Config.PROFILE_REQUESTS decides."""
+    if x_profile is None:
+        return None
+    return x_profile.strip().lower() in ("1", "true", "yes", "on")
+
+def resolve_profile(name: Optional[str]):
+    """The requested pipeline profile (400 if unknown)."""
+    try:
+        return get_profile(name or "")
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+def build_analysis_response(result) -> dict:
+    """The /analyze response body for an AnalysisResult."""
+    # Build response with the saved analysis ID and a Timestamp to verify freshness
+    analysis_id = result.analysis_id
+    timestamp = time.strftime("%H:%M:%S")
+
+    return {
+        "analysis_id": analysis_id,
+        "timestamp": timestamp,
+        "profile": result.profile,
+        "summary": {
+            "detected_language": get_language_name(result.language),
+            "duration": result.duration,
+            "total_silences": len(result.silence_segments),
+            "total_highlights": sum(1 for s in result.suggestions if s.suggestion_type.value == "highlight"),
+            "total_suggestions": len(result.suggestions)
+        },
+        "suggestions": [s.to_dict() for s in result.suggestions]
+    }
+
+async def run_analysis(
+    video_path: str,
+    source_name: Optional[str] = None,
+    pipeline_profile: Optional[str] = None,
+    profiling: Optional[bool] = None
+) -> dict:
+    """Admission-controlled analysis of a file on disk; returns the /analyze response body."""
+    if global_pipeline is None:
+        raise HTTPException(status_code=500, detail="AI Pipeline failed to initialize. Check server logs.")
+    selected = resolve_profile(pipeline_profile)
+
+    # Probe duration first to estimate the job's cost, then wait for a slot.
+    # The pipeline itself runs in a worker thread so queued requests aren't blocked.
+    duration = await run_in_threadpool(global_pipeline.get_video_duration, video_path)
+    try:
+        # Cheaper profiles (smaller models, fewer stages) count as less work
+        async with admission.admit(duration * selected.cost_factor):
+            result = await run_in_threadpool(
+                global_pipeline.analyze_video, video_path, duration,
+                pipeline_profile=selected.name, profiling=profiling, source_name=source_name
+            )
+    except AdmissionRejected as e:
+        print(f"[DEBUG] Analysis rejected, queue full (retry after {e.retry_after}s)")
+        raise HTTPException(status_code=429, detail=str(e), headers={"Retry-After": str(e.retry_after)})
+
+    print(f"[DEBUG] Analysis complete. Detected Language: {result.language}")
+    print(f"[DEBUG] Suggestions: {len(result.suggestions)}")
+
+    response = build_analysis_response(result)
+
+    print(f"[DEBUG] Returning Analysis ID: {response['analysis_id']} at {response['timestamp']}")
+    return response
+
+def parse_range(range_header: Optional[str], length: int):
+    """(start, end) inclusive for a single `bytes=` range, None for no/unsupported ranges, 416 if unsatisfiable."""
+    if not range_header or not range_header.startswith("bytes=") or "," in range_header:
+        return None
+    first, _, last = range_header[len("bytes="):].strip().partition("-")
+    try:
+        if first:
+            start = int(first)
+            end = min(int(last), length - 1) if last else length - 1
+        else:
+            # Suffix range: the last N bytes
+            start, end = max(0, length - int(last)), length - 1
+    except ValueError:
+        return None
+    if start > end or start >= length:
+        raise HTTPException(status_code=416, detail="Range not satisfiable", headers={"Content-Range": f"bytes */{length}"})
+    return start, end
+
+def close_updates(updates):
+    """Stops a pipeline generator (and cleans its workspace) when the stream ends early."""
+    try:
+        updates.close()
+    except ValueError:
+        # Still running a stage in the worker thread the disconnect abandoned; it stops
+        # at its next yield, since nothing resumes it, and is closed when collected
+        print("[DEBUG] Stream closed while a stage was running")
+
+def sse_event(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
 # --- Endpoints ---
 
 @app.get("/")
@@ -73,9 +192,11 @@ async def root():
     return {"message": "AI Video Editing Assistant Backend is running!"}
 
 @app.post("/analyze")
-async def analyze_video(video: UploadFile = File(...)):
+async def analyze_video(video: UploadFile = File(...), profile: Optional[str] = None, x_profile: Optional[str] = Header(None)):
     """
     Receive a video file, save it temporarily, run AI analysis, and return results.
+    `?profile=fast|balanced|accurate` picks the models and stages (default DEFAULT_PROFILE).
+    Send `X-Profile: 1` to profile this run (report at /debug/profile/{analysis_id}).
     """
     # Create a unique temp file path
     temp_dir = tempfile.gettempdir()
@@ -94,43 +215,364 @@ async def analyze_video(video: UploadFile = File(...)):
         print(f"[DEBUG] Temp File: {temp_video_path} (Size: {total_size} bytes)")
 
         # Run Analysis using Global Pipeline
-        if global_pipeline is None:
-            raise HTTPException(status_code=500, detail="AI Pipeline failed to initialize. Check server logs.")
-            
-        result = global_pipeline.analyze_video(temp_video_path)
+        return await run_analysis(
+            temp_video_path, source_name=video.filename, pipeline_profile=profile, profiling=wants_profiling(x_profile)
+        )
 
-        print(f"[DEBUG] Analysis complete. Detected Language: {result.language}")
-        print(f"[DEBUG] Suggestions: {len(result.suggestions)}")
+    except HTTPException:
+        raise
+    except Exception as e:
+        print(f"[ERROR] {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+    finally:
+        # Cleanup
+        if os.path.exists(temp_video_path):
+            os.remove(temp_video_path)
 
-        # Build response with a unique ID and Timestamp to verify freshness
-        import time
-        analysis_id = str(uuid.uuid4())[:8]
-        timestamp = time.strftime("%H:%M:%S")
+@app.post("/analyze/stream")
+async def analyze_video_stream(video: UploadFile = File(...), profile: Optional[str] = None, x_profile: Optional[str] = Header(None)):
+    """
+    Same as /analyze, but streams suggestions as Server-Sent Events while the analysis runs:
+    silence cuts first, then energy highlights, then transcript/redundancy results.
+    Events: `stage`, `suggestion` (new or revised, matched by `id`), `remove` (withdrawn `id`),
+    `done` (the full /analyze response) and `error`.
+    """
+    temp_dir = tempfile.gettempdir()
+    file_extension = os.path.splitext(video.filename)[1]
+    temp_video_path = os.path.join(temp_dir, f"{uuid.uuid4()}{file_extension}")
 
-        response = {
-            "analysis_id": analysis_id,
-            "timestamp": timestamp,
-            "summary": {
-                "detected_language": get_language_name(result.language),
-                "duration": result.duration,
-                "total_silences": len(result.silence_segments),
-                "total_highlights": sum(1 for s in result.suggestions if s.suggestion_type.value == "highlight"),
-                "total_suggestions": len(result.suggestions)
-            },
-            "suggestions": [s.to_dict() for s in result.suggestions]
-        }
-        
-        print(f"[DEBUG] Returning Analysis ID: {analysis_id} at {timestamp}")
-        return response
+    try:
+        with open(temp_video_path, "wb") as buffer:
+            shutil.copyfileobj(video.file, buffer)
+
+        print(f"\n[DEBUG] --- NEW STREAMING ANALYSIS REQUEST ---")
+        print(f"[DEBUG] Original File: {video.filename}")
+
+        if global_pipeline is None:
+            raise HTTPException(status_code=500, detail="AI Pipeline failed to initialize. Check server logs.")
+        selected = resolve_profile(profile)
 
+        duration = await run_in_threadpool(global_pipeline.get_video_duration, temp_video_path)
+        # Held until the stream ends, not just until this handler returns
+        cost = await admission.acquire(duration * selected.cost_factor)
     except Exception as e:
+        if os.path.exists(temp_video_path):
+            os.remove(temp_video_path)
+        if isinstance(e, HTTPException):
+            raise
+        if isinstance(e, AdmissionRejected):
+            raise HTTPException(status_code=429, detail=str(e), headers={"Retry-After": str(e.retry_after)})
         print(f"[ERROR] {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
-    finally:
-        # Cleanup
+
+    released = False
+
+    def cleanup():
+        # Runs from the generator's finally and again as a background task (which also
+        # covers a response whose body never started); only the first call does anything
+        nonlocal released
+        if released:
+            return
+        released = True
+        admission.release(cost)
         if os.path.exists(temp_video_path):
             os.remove(temp_video_path)
 
+    async def event_stream():
+        updates = global_pipeline.iter_analysis(
+            temp_video_path, duration,
+            pipeline_profile=selected.name, profiling=wants_profiling(x_profile), source_name=video.filename
+        )
+        try:
+            async for update in iterate_in_threadpool(updates):
+                yield sse_event("stage", {"stage": update.stage})
+                for s in update.changed:
+                    yield sse_event("suggestion", s.to_dict())
+                for suggestion_id in update.removed:
+                    yield sse_event("remove", {"id": suggestion_id})
+                if update.result is not None:
+                    yield sse_event("done", build_analysis_response(update.result))
+        except Exception as e:
+            print(f"[ERROR] {str(e)}")
+            yield sse_event("error", {"detail": str(e)})
+        finally:
+            try:
+                # A client disconnect cancels this generator; shielded so the await
+                # doesn't re-raise the cancellation and skip the cleanup below
+                with anyio.CancelScope(shield=True):
+                    await run_in_threadpool(close_updates, updates)
+            finally:
+                cleanup()
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        background=BackgroundTask(cleanup)
+    )
+
+# --- Resumable chunked uploads ---
+# POST /uploads -> PUT /uploads/{id}/chunks/{index} (any order, in parallel)
+# -> GET /uploads/{id} to see what is missing -> POST /uploads/{id}/finalize
+
+def _get_uploads() -> "UploadManager":
+    if uploads is None:
+        raise HTTPException(status_code=500, detail="AI Pipeline failed to initialize. Check server logs.")
+    return uploads
+
+@app.post("/uploads")
+async def create_upload(request: CreateUploadRequest):
+    """
+    Start a resumable upload. Returns the upload_id and the chunk size/count to use.
+    """
+    try:
+        manifest = _get_uploads().create(request.filename, request.total_size, request.chunk_size)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {k: manifest[k] for k in ("upload_id", "filename", "total_size", "chunk_size", "chunk_count")}
+
+@app.put("/uploads/{upload_id}/chunks/{index}")
+async def upload_chunk(upload_id: str, index: int, request: Request, x_chunk_sha256: Optional[str] = Header(None)):
+    """
+    Upload one chunk as the raw request body. The body is streamed to disk as it
+    arrives. Send its hex SHA-256 in the X-Chunk-SHA256 header to have it verified.
+    """
+    try:
+        writer = _get_uploads().open_chunk(upload_id, index)
+    except FileNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    try:
+        async for data in request.stream():
+            if data:
+                writer.write(data)
+        digest = writer.commit(x_chunk_sha256)
+    except ValueError as e:
+        writer.abort()
+        raise HTTPException(status_code=422, detail=str(e))
+    except BaseException:
+        # Client went away mid-chunk: the chunk stays missing and can be re-sent
+        writer.abort()
+        raise
+    return {"upload_id": upload_id, "index": index, "sha256": digest}
+
+@app.get("/uploads/{upload_id}")
+async def upload_status(upload_id: str):
+    """
+    Which chunks have arrived and which are still missing (to resume an upload).
+    """
+    try:
+        return _get_uploads().status(upload_id)
+    except FileNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+
+@app.post("/uploads/{upload_id}/finalize")
+async def finalize_upload(upload_id: str, profile: Optional[str] = None, x_profile: Optional[str] = Header(None)):
+    """
+    Run the analysis on a completed upload. Returns the same response as /analyze.
+    The upload is deleted afterwards. Takes the same `?profile=` as /analyze.
+    """
+    manager = _get_uploads()
+    # Checked before anything runs so a typo doesn't cost the uploaded data
+    resolve_profile(profile)
+    try:
+        video_path = manager.finalize(upload_id)
+        source_name = manager.manifest(upload_id)["filename"]
+    except FileNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+
+    print(f"\n[DEBUG] --- NEW ANALYSIS REQUEST (chunked upload {upload_id}) ---")
+    try:
+        response = await run_analysis(
+            video_path, source_name=source_name, pipeline_profile=profile, profiling=wants_profiling(x_profile)
+        )
+    except HTTPException as e:
+        # Keep the data so the client can retry finalize after a 429
+        if e.status_code != 429:
+            manager.delete(upload_id)
+        raise
+    except Exception as e:
+        print(f"[ERROR] {str(e)}")
+        manager.delete(upload_id)
+        raise HTTPException(status_code=500, detail=str(e))
+    manager.delete(upload_id)
+    return response
+
+@app.delete("/uploads/{upload_id}")
+async def delete_upload(upload_id: str):
+    """
+    Abort an upload and delete its data.
+    """
+    try:
+        _get_uploads().manifest(upload_id)
+    except FileNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    _get_uploads().delete(upload_id)
+    return {"upload_id": upload_id, "deleted": True}
+
+@app.get("/analysis/{analysis_id}/export")
+async def export_analysis(analysis_id: str, format: str = "edl", source_name: Optional[str] = None):
+    """
+    Export a saved analysis as an editor timeline with every CUT removed.
+    format: "edl" (CMX3600) or "fcpxml". source_name: file name the editor should link to.
+    """
+    if global_pipeline is None:
+        raise HTTPException(status_code=500, detail="AI Pipeline failed to initialize. Check server logs.")
+    try:
+        record = global_pipeline.store.load(analysis_id)
+    except (ValueError, FileNotFoundError) as e:
+        raise HTTPException(status_code=404, detail=str(e))
+
+    suggestions = global_pipeline.store.load_suggestions(analysis_id)
+    intervals = keep_intervals(suggestions, record["duration"])
+    media_info = record.get("media_info") or {}
+    # The uploaded file's own name, not the server-side temp copy it was analysed from
+    name = source_name or record.get("source_name") or os.path.basename(record["video_path"])
+    fps = media_info.get("fps") or 30.0
+
+    if format == "edl":
+        content = to_edl(intervals, name, fps=fps)
+        media_type, extension = "text/plain", "edl"
+    elif format == "fcpxml":
+        content = to_fcpxml(
+            intervals, name, record["duration"], fps=fps,
+            width=media_info.get("width") or 1920, height=media_info.get("height") or 1080
+        )
+        media_type, extension = "application/xml", "fcpxml"
+    else:
+        raise HTTPException(status_code=400, detail=f"Unknown export format: {format}")
+
+    # Keep a copy next to the analysis
+    with open(global_pipeline.store.path_for(analysis_id, f"rough_cut.{extension}"), "w", encoding="utf-8") as f:
+        f.write(content)
+
+    return Response(
+        content=content,
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{analysis_id}.{extension}"'}
+    )
+
+@app.get("/debug/profile/{analysis_id}")
+async def get_profile_report(analysis_id: str, format: str = "json"):
+    """
+    Profiling report of an analysis run with profiling enabled (X-Profile header or
+    PROFILE_REQUESTS). format: "json" (per-stage wall/CPU time, peak RSS and the
+    hottest functions), "txt" (pstats listing) or "pstats" (raw, for snakeviz).
+    """
+    if global_pipeline is None:
+        raise HTTPException(status_code=500, detail="AI Pipeline failed to initialize. Check server logs.")
+    files = {
+        "json": (PROFILE_JSON, "application/json"),
+        "txt": (PROFILE_TEXT, "text/plain"),
+        "pstats": (PROFILE_STATS, "application/octet-stream"),
+    }
+    if format not in files:
+        raise HTTPException(status_code=400, detail=f"Unknown profile format: {format}")
+    name, media_type = files[format]
+    try:
+        path = os.path.join(global_pipeline.store.analysis_dir(analysis_id), name)
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    if not os.path.exists(path):
+        raise HTTPException(status_code=404, detail=f"No profile recorded for analysis {analysis_id}")
+
+    with open(path, "rb") as f:
+        content = f.read()
+    headers = {}
+    if format == "pstats":
+        headers["Content-Disposition"] = f'attachment; filename="{analysis_id}.pstats"'
+    return Response(content=content, media_type=media_type, headers=headers)
+
+@app.get("/analysis/{analysis_id}/transcript")
+async def get_transcript(analysis_id: str, compress: bool = False):
+    """
+    The transcript as columnar msgpack: start/end (and, with WORD_TIMESTAMPS or the
+    accurate profile, per-word start/end/probability) as raw float32 arrays, and the
+    text as one UTF-8 blob with uint32 byte offsets. `compress=true` deflates the body
+    (Content-Encoding: deflate, decoded transparently by browsers).
+    """
+    if global_pipeline is None:
+        raise HTTPException(status_code=500, detail="AI Pipeline failed to initialize. Check server logs.")
+    try:
+        path = os.path.join(global_pipeline.store.analysis_dir(analysis_id), TRANSCRIPT_FILE)
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    if not os.path.exists(path):
+        raise HTTPException(status_code=404, detail=f"No transcript for analysis {analysis_id}")
+
+    with open(path, "rb") as f:
+        content = f.read()
+    headers = {"Cache-Control": "public, max-age=86400"}
+    if compress:
+        content = zlib.compress(content, 6)
+        headers["Content-Encoding"] = "deflate"
+    return Response(content=content, media_type="application/x-msgpack", headers=headers)
+
+@app.get("/analysis/{analysis_id}/waveform")
+async def get_waveform(analysis_id: str, level: Optional[int] = None, range_header: Optional[str] = Header(None, alias="Range")):
+    """
+    Audio waveform for drawing the timeline.
+    Without `level`: JSON index (sample rate and, per level, samples_per_bin and bins).
+    With `level`: that level as raw little-endian int16 triples (min, max, rms) per bin.
+    Supports `Range: bytes=...` so a client can fetch only the visible part.
+    """
+    if global_pipeline is None:
+        raise HTTPException(status_code=500, detail="AI Pipeline failed to initialize. Check server logs.")
+    try:
+        path = os.path.join(global_pipeline.store.analysis_dir(analysis_id), WAVEFORM_FILE)
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    if not os.path.exists(path):
+        raise HTTPException(status_code=404, detail=f"No waveform for analysis {analysis_id}")
+
+    index = read_index(path)
+    if level is None:
+        return {
+            "analysis_id": analysis_id,
+            "sample_rate": index["sample_rate"],
+            "total_samples": index["total_samples"],
+            "levels": [{k: l[k] for k in ("level", "samples_per_bin", "bins")} for l in index["levels"]]
+        }
+    if not 0 <= level < len(index["levels"]):
+        raise HTTPException(status_code=400, detail=f"level must be between 0 and {len(index['levels']) - 1}")
+
+    info = index["levels"][level]
+    length = info["length"]
+    byte_range = parse_range(range_header, length)
+    start, end = byte_range or (0, length - 1)
+    with open(path, "rb") as f:
+        f.seek(info["offset"] + start)
+        content = f.read(end - start + 1) if length else b""
+
+    headers = {
+        "Accept-Ranges": "bytes",
+        "Cache-Control": "public, max-age=86400",
+        "X-Sample-Rate": str(index["sample_rate"]),
+        "X-Samples-Per-Bin": str(info["samples_per_bin"]),
+        "X-Bins": str(info["bins"]),
+    }
+    if byte_range is None:
+        return Response(content=content, media_type="application/octet-stream", headers=headers)
+    headers["Content-Range"] = f"bytes {start}-{end}/{length}"
+    return Response(content=content, status_code=206, media_type="application/octet-stream", headers=headers)
+
+@app.get("/metrics")
+async def metrics():
+    """
+    Operational metrics (scratch disk usage, active jobs, loaded models).
+    """
+    if global_pipeline is None:
+        raise HTTPException(status_code=500, detail="AI Pipeline failed to initialize. Check server logs.")
+    return {
+        "workspace": global_pipeline.workspace.usage(),
+        "admission": admission.stats(),
+        "models": global_pipeline.models.stats()
+    }
+
 @app.post("/chat")
 async def chat(request: ChatRequest):
     """
@@ -143,7 +585,6 @@ async def chat(request: ChatRequest):
         # Convert analysis_summary to string context if provided
         context = ""
         if request.analysis_summary:
-            import json
             context = json.dumps(request.analysis_summary)
 
         reply = global_assistant.chat(
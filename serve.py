@@ -0,0 +1,148 @@
+"""
+Multi-worker launcher for the backend that loads the AI models only once.
+
+`uvicorn --workers N` imports main.py in every worker, so each process loads its
+own Whisper and SentenceTransformer weights. Here the parent process imports
+main.py (loading the models), then forks the workers, which share the weight
+pages copy-on-write. Memory per extra worker is then roughly the size of its
+Python heap instead of a full copy of every model.
+Only the default profile's models are preloaded; models for other profiles
+(?profile=fast|accurate) are loaded on demand inside each worker.
+
+Usage (from the repository root, POSIX only):
+    python serve.py --workers 4 --port 8000
+"""
+import argparse
+import gc
+import os
+import signal
+import socket
+import sys
+import time
+
+# Add AI_ML/src to path so we can import VideoEditorAI (same as main.py)
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "AI_ML", "src"))
+
+from VideoEditorAI.core.config import settings
+
+def _torch_modules(pipeline):
+    """The torch models preloaded by the pipeline (the default profile's Whisper and sentence encoder)."""
+    return [model for model in pipeline.models.loaded().values() if hasattr(model, "parameters")]
+
+def _prepare_for_fork(pipeline):
+    """Freeze the loaded models so forked workers never write to the shared pages."""
+    try:
+        import torch
+    except ImportError:
+        torch = None
+
+    if pipeline is not None and torch is not None:
+        for module in _torch_modules(pipeline):
+            module.eval()
+            for param in module.parameters():
+                param.requires_grad_(False)
+
+    # Move every object allocated so far (models included) into the permanent
+    # generation. Otherwise the first GC pass in each worker touches their
+    # headers and un-shares the pages.
+    gc.collect()
+    gc.freeze()
+
+def _run_worker(app, sock: socket.socket, threads: int):
+    import uvicorn
+
+    try:
+        import torch
+        torch.set_num_threads(threads)
+    except ImportError:
+        pass
+
+    # Workers exit on SIGTERM through uvicorn's own handlers
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    signal.signal(signal.SIGINT, signal.SIG_DFL)
+
+    config = uvicorn.Config(app, log_level="info")
+    server = uvicorn.Server(config)
+    server.run(sockets=[sock])
+
+def _spawn(app, sock: socket.socket, threads: int) -> int:
+    pid = os.fork()
+    if pid == 0:
+        code = 0
+        try:
+            _run_worker(app, sock, threads)
+        except BaseException as e:
+            print(f"[ERROR] Worker {os.getpid()} crashed: {e}")
+            code = 1
+        finally:
+            os._exit(code)
+    print(f"INFO:serve:Started worker {pid}")
+    return pid
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve the backend with shared, preloaded models")
+    parser.add_argument("--host", type=str, default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--workers", type=int, default=settings.SERVE_WORKERS, help="Number of forked HTTP workers")
+    parser.add_argument("--threads", type=int, default=settings.TORCH_THREADS_PER_WORKER,
+                        help="Torch intra-op threads per worker (0 = CPU count / workers)")
+    args = parser.parse_args()
+
+    if not hasattr(os, "fork"):
+        print("Error: shared-model serving needs fork(); use `uvicorn main:app` on this platform.")
+        return
+
+    threads = args.threads or max(1, (os.cpu_count() or 1) // args.workers)
+
+    # Bind before loading models so a busy port fails fast
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((args.host, args.port))
+    sock.listen(2048)
+    sock.set_inheritable(True)
+
+    # Importing the backend loads the global pipeline once, in this process
+    import main as backend
+    _prepare_for_fork(backend.global_pipeline)
+
+    workers = {}
+    for _ in range(args.workers):
+        workers[_spawn(backend.app, sock, threads)] = time.monotonic()
+
+    shutting_down = False
+
+    def _shutdown(signum, frame):
+        nonlocal shutting_down
+        shutting_down = True
+        for pid in list(workers):
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    signal.signal(signal.SIGTERM, _shutdown)
+    signal.signal(signal.SIGINT, _shutdown)
+
+    print(f"INFO:serve:Serving on http://{args.host}:{args.port} with {args.workers} workers ({threads} torch threads each)")
+    while workers:
+        try:
+            pid, status = os.wait()
+        except ChildProcessError:
+            break
+        except InterruptedError:
+            continue
+        started = workers.pop(pid, None)
+        if started is None or shutting_down:
+            continue
+
+        print(f"[ERROR] Worker {pid} exited (status {status}), restarting...")
+        # Avoid a tight restart loop if workers die right after starting
+        if time.monotonic() - started < 1.0:
+            time.sleep(1.0)
+        workers[_spawn(backend.app, sock, threads)] = time.monotonic()
+
+    sock.close()
+    print("INFO:serve:All workers stopped.")
+
+if __name__ == "__main__":
+    main()